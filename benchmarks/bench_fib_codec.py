@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Compare the Fibonacci channel codec with zlib.
+
+Run from the repository root::
+
+    python benchmarks/bench_fib_codec.py
+
+Synthetic int16 data is a bounded random walk, a rough stand-in for
+wide-band extracellular recordings.  Reports compression ratio and
+throughput in MB/s of raw data for both codecs.
+"""
+
+import time
+import zlib
+
+import numpy as np
+
+from spyglass_workshop import fib_codec
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    out = func(*args)
+    return out, time.perf_counter() - start
+
+
+def make_recording(n_channels=32, n_samples=300_000, step=20, seed=0):
+    """Return an int16 random-walk recording of the given size."""
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(-step, step + 1, size=(n_channels, n_samples))
+    return np.clip(np.cumsum(steps, axis=1), -32_768, 32_767).astype(np.int16)
+
+
+def compare(data, block_size=fib_codec.DEFAULT_BLOCK_SIZE, zlib_level=6):
+    """Return ``{codec: (ratio, encode MB/s, decode MB/s)}`` for *data*."""
+    mb = data.nbytes / 1e6
+    fib_buf, fib_enc = _timed(fib_codec.encode, data, block_size)
+    fib_out, fib_dec = _timed(fib_codec.decode, fib_buf)
+    raw = data.tobytes()
+    z_buf, z_enc = _timed(zlib.compress, raw, zlib_level)
+    z_out, z_dec = _timed(zlib.decompress, z_buf)
+    assert np.array_equal(fib_out, data) and z_out == raw
+    return {
+        "fibonacci": (data.nbytes / len(fib_buf), mb / fib_enc, mb / fib_dec),
+        f"zlib-{zlib_level}": (
+            data.nbytes / len(z_buf),
+            mb / z_enc,
+            mb / z_dec,
+        ),
+    }
+
+
+if __name__ == "__main__":
+    for step in (5, 20, 200):
+        print(f"random walk, step <= {step}")
+        for name, (ratio, enc, dec) in compare(
+            make_recording(step=step)
+        ).items():
+            print(
+                f"  {name:>10}: ratio {ratio:5.2f}"
+                f"  encode {enc:7.1f} MB/s  decode {dec:7.1f} MB/s"
+            )
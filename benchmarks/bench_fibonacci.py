@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Benchmarks for :mod:`spyglass_workshop.fibonacci`.
+
+Run from the repository root::
+
+    python benchmarks/bench_fibonacci.py
+
+Prints the best-of-N wall time of each strategy.  The crossover printed
+first is what ``fibonacci.DOUBLING_THRESHOLD`` is set from.
+"""
+
+import io
+import random
+import timeit
+
+from spyglass_workshop import bigint, fibonacci
+
+
+def _best(func, *args, number=1, repeat=3):
+    """Return the best time per call, in seconds."""
+    timer = timeit.Timer(lambda: func(*args))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def iterative(n: int) -> int:
+    """Reference O(n) loop, as ``f`` was originally written."""
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+def doubling(n: int) -> int:
+    """O(log n) polynomial doubling in the shared recurrence engine."""
+    return fibonacci.f(n, strategy="doubling")
+
+
+def crossover(max_n: int = 256) -> int:
+    """Return the first n at which fast doubling beats the loop."""
+    for n in range(8, max_n, 4):
+        if _best(doubling, n, number=2_000) < _best(iterative, n, number=2_000):
+            return n
+    return max_n
+
+
+def bench_f():
+    print(f"iterative / doubling crossover: n = {crossover()}")
+    print(f"{'n':>10} {'iterative':>12} {'doubling':>12}")
+    for n in (10**3, 10**4, 10**5, 10**6, 10**7):
+        loop = f"{_best(iterative, n):12.6f}" if n <= 10**5 else f"{'-':>12}"
+        print(f"{n:>10} {loop} {_best(doubling, n, repeat=1):12.6f}")
+
+
+def bench_f_many():
+    rng = random.Random(0)
+    cases = {
+        "10k dense in [0, 1e5)": [rng.randrange(10**5) for _ in range(10**4)],
+        "1k sparse in [0, 1e6)": [rng.randrange(10**6) for _ in range(10**3)],
+        "1k clustered near 1e6": [
+            10**6 + rng.randrange(5_000) for _ in range(10**3)
+        ],
+    }
+    print(f"{'indices':>24} {'[f(i) ...]':>12} {'f_many':>12}")
+    for name, indices in cases.items():
+        naive = _best(lambda: [fibonacci.f(i) for i in indices], repeat=1)
+        batch = _best(fibonacci.f_many, indices, repeat=1)
+        print(f"{name:>24} {naive:12.4f} {batch:12.4f}")
+
+
+def bench_backends(sizes=(10**5, 10**6, 10**7)):
+    """Time ``f(n)`` and writing F(n) in decimal for every backend."""
+    print(f"{'backend':>8} {'n':>10} {'f(n)':>10} {'write F(n)':>12}")
+    for name in bigint.available_backends():
+        fibonacci.set_backend(name)
+        for n in sizes:
+            value = _best(fibonacci.f, n, repeat=1)
+            write = _best(
+                lambda n=n: fibonacci.write_int(
+                    fibonacci._f_native(n), io.StringIO()
+                ),
+                repeat=1,
+            )
+            print(f"{name:>8} {n:>10} {value:10.4f} {write:12.4f}")
+    fibonacci.set_backend("int")
+
+
+if __name__ == "__main__":
+    bench_f()
+    bench_f_many()
+    bench_backends()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Compare SQL statements per key for the ``MyAnalysis`` populate paths.
+
+Needs a database connection configured as for the workshop notebooks
+(e.g. the MySQL container in ``database/``).  Run from the repository
+root::
+
+    python benchmarks/bench_populate.py 10000
+
+Inserts synthetic ``bench_*`` subjects into your workshop schema, times
+``populate`` with and without the ``MyParams`` cache and
+``populate_batched`` on them, and deletes them again.
+"""
+
+import sys
+import time
+
+import datajoint as dj  # type: ignore
+
+from spyglass_workshop import schema_template as st
+from spyglass_workshop.utils import count_queries
+
+BENCH = 'subject_id LIKE "bench\\_%"'
+
+
+def setup(n_keys: int) -> None:
+    """Insert *n_keys* subjects, each paired with the default parameters."""
+    st.MyParams.insert_default()
+    subjects = [[f"bench_{i:06d}", {}] for i in range(n_keys)]
+    st.MySubject.insert(subjects, skip_duplicates=True)
+    st.MyAnalysisSelection.insert(
+        [{"subject_id": s, "param_name": "default"} for s, _ in subjects],
+        skip_duplicates=True,
+    )
+
+
+def clear() -> None:
+    """Delete the computed rows for the synthetic subjects."""
+    (st.MyAnalysis & BENCH).delete(safemode=False)
+
+
+def measure(populate) -> tuple[float, int, int]:
+    """Return ``(seconds, queries, keys)`` for one populate call."""
+    before = len(st.MyAnalysis & BENCH)
+    with count_queries(dj.conn()) as counter:
+        start = time.perf_counter()
+        populate()
+        elapsed = time.perf_counter() - start
+    return elapsed, counter["queries"], len(st.MyAnalysis & BENCH) - before
+
+
+if __name__ == "__main__":
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    setup(n_keys)
+    try:
+        runs = {
+            "populate, no cache": lambda: st.MyAnalysis.populate(
+                BENCH, cache_params=False
+            ),
+            "populate": lambda: st.MyAnalysis.populate(BENCH),
+            "populate_batched": lambda: st.MyAnalysis().populate_batched(BENCH),
+        }
+        for name, populate in runs.items():
+            clear()
+            seconds, queries, keys = measure(populate)
+            print(
+                f"{name:>18}: {keys} keys in {seconds:.2f} s"
+                f"  ({keys / seconds:,.0f} keys/s, {queries} queries,"
+                f" {queries / max(keys, 1):.2f} queries/key)"
+            )
+    finally:
+        clear()
+        (st.MyAnalysisSelection & BENCH).delete(safemode=False)
+        (st.MySubject & BENCH).delete(safemode=False)
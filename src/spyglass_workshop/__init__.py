@@ -2,9 +2,65 @@
 
 __version__ = "0.0.1"
 
-from spyglass_workshop.fibonacci import f, f_list, user_input
+from spyglass_workshop.fibonacci import (
+    FibSequence,
+    LinearRecurrence,
+    calibrate,
+    crossover_report,
+    disable_cache,
+    enable_cache,
+    f,
+    f_array,
+    f_digits,
+    f_iter,
+    f_leading_digits,
+    f_list,
+    f_log10,
+    f_many,
+    f_mod,
+    f_mod_many,
+    f_range,
+    format_int,
+    get_backend,
+    load_calibration,
+    pisano_period,
+    set_backend,
+    user_input,
+    write_f_list,
+    write_fib,
+    zeckendorf_decode,
+    zeckendorf_encode,
+)
 
 # __all__ is the list of objects that can be imported via
 # `from spyglass_workshop import X`
 
-__all__ = ["f", "f_list", "user_input"]
+__all__ = [
+    "FibSequence",
+    "LinearRecurrence",
+    "calibrate",
+    "crossover_report",
+    "disable_cache",
+    "enable_cache",
+    "f",
+    "f_array",
+    "f_digits",
+    "f_iter",
+    "f_leading_digits",
+    "f_list",
+    "f_log10",
+    "f_many",
+    "f_mod",
+    "f_mod_many",
+    "f_range",
+    "format_int",
+    "get_backend",
+    "load_calibration",
+    "pisano_period",
+    "set_backend",
+    "user_input",
+    "write_f_list",
+    "write_fib",
+    "zeckendorf_decode",
+    "zeckendorf_encode",
+]
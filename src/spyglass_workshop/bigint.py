@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Big-integer arithmetic backends for :mod:`spyglass_workshop.fibonacci`.
+
+For large indices, fast doubling spends nearly all of its time
+multiplying big integers.  A backend supplies the number type that this
+arithmetic runs in:
+
+- ``"int"``: the built-in :class:`int` (Karatsuba multiplication).  Always
+  available.
+- ``"gmpy2"``: :class:`gmpy2.mpz`, backed by GMP's FFT multiplication.
+  Available when ``gmpy2`` is installed.
+- ``"decimal"``: :class:`decimal.Decimal` in an exact context.  libmpdec
+  multiplies huge operands with a number-theoretic transform, and the
+  result is already in base 10, so printing it is linear.
+
+Values stay in the backend type while they are computed and formatted,
+and are converted to :class:`int` only when returned to the caller.
+"""
+
+import contextlib
+import decimal
+from collections.abc import Callable
+
+try:
+    import gmpy2
+except ImportError:  # pragma: no cover - optional dependency
+    gmpy2 = None
+
+# Exact decimal arithmetic: libmpdec switches to number-theoretic-transform
+# multiplication for huge operands, and any rounding raises Inexact.
+EXACT = decimal.Context(
+    prec=decimal.MAX_PREC,
+    Emax=decimal.MAX_EMAX,
+    Emin=decimal.MIN_EMIN,
+    traps=[decimal.Inexact],
+)
+
+# Digit strings up to this length are converted with a single int() call.
+_STR_CUTOFF = 2_048
+_FORMAT_CODES = {2: "b", 8: "o", 10: "d", 16: "x"}
+
+
+class Backend:
+    """A number type that Fibonacci arithmetic can run in.
+
+    Parameters
+    ----------
+    name : str
+        Registry key.
+    from_int : callable
+        Convert an :class:`int` to the backend type.
+    to_int : callable
+        Convert a backend value back to :class:`int`.
+    context : callable, optional
+        Return a context manager that must be active while computing,
+        e.g. the exact decimal context.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        from_int: Callable,
+        to_int: Callable,
+        context: Callable = contextlib.nullcontext,
+    ):
+        self.name = name
+        self.from_int = from_int
+        self.to_int = to_int
+        self.context = context
+
+    def __repr__(self) -> str:
+        return f"Backend({self.name!r})"
+
+
+def _digits_to_int(digits: str) -> int:
+    """Convert a decimal digit string to int by divide and conquer.
+
+    ``int(str)`` is quadratic in the number of digits and capped by
+    ``sys.get_int_max_str_digits()``; splitting the string in halves and
+    recombining with multiplication by cached powers of ten is not.
+    """
+    powers: dict[int, int] = {}
+
+    def inner(lo: int, hi: int) -> int:
+        if hi - lo <= _STR_CUTOFF:
+            return int(digits[lo:hi])
+        half = (hi - lo) >> 1
+        if half not in powers:
+            powers[half] = 10**half
+        return inner(lo, hi - half) * powers[half] + inner(hi - half, hi)
+
+    sign = digits.startswith("-")
+    value = inner(int(sign), len(digits))
+    return -value if sign else value
+
+
+def _decimal_to_int(x: decimal.Decimal) -> int:
+    """Convert an integral Decimal to int in subquadratic time."""
+    return _digits_to_int(EXACT.to_sci_string(x))
+
+
+BACKENDS: dict[str, Backend] = {"int": Backend("int", int, int)}
+BACKENDS["decimal"] = Backend(
+    "decimal",
+    decimal.Decimal,
+    _decimal_to_int,
+    lambda: decimal.localcontext(EXACT),
+)
+if gmpy2 is not None:  # pragma: no branch
+    BACKENDS["gmpy2"] = Backend("gmpy2", gmpy2.mpz, int)
+
+
+def available_backends() -> list[str]:
+    """Return the names of the backends usable in this environment."""
+    return sorted(BACKENDS)
+
+
+def format_native(x, base: int = 10) -> str:
+    """Return the digits of a non-int backend value, without a prefix.
+
+    ``mpz`` values format themselves in any base.  Decimals are already
+    base 10; other bases go through :class:`int`.
+    """
+    if isinstance(x, decimal.Decimal):
+        if base == 10:
+            return EXACT.to_sci_string(x)
+        x = _decimal_to_int(x)
+    return format(x, _FORMAT_CODES[base])
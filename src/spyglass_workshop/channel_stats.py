@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+"""Channel statistics — streaming version for long recordings.
+
+Computes the same per-channel summary as
+:func:`spyglass_workshop.channel_stats_buggy.summarize`, but reads the
+recording in blocks and accumulates the moments as it goes, so a session
+never has to fit in memory.  An optional polyphase decimation stage sits
+between the reader and the accumulator for LFP-band QC, where the signal
+is only needed at a fraction of the acquisition rate.
+
+Data layout is channels-first, ``(n_channels, n_samples)``, to match
+``summarize``.  Any array-like that supports 2-D slicing works as input,
+including lazily-loaded ``h5py`` datasets.
+"""
+
+from collections.abc import Iterable, Iterator
+
+import numpy as np
+from scipy import signal
+
+DEFAULT_BLOCK_SIZE = 65_536  # samples per channel per block
+# Samples per channel held back to derive histogram ranges from.
+MIN_RANGE_SAMPLES = 1_000
+
+
+def iter_blocks(
+    data, block_size: int = DEFAULT_BLOCK_SIZE, time_axis: int = 1
+) -> Iterator:
+    """Yield consecutive ``(n_channels, block_size)`` slices of *data*.
+
+    Parameters
+    ----------
+    data : array-like
+        Two-dimensional ``(n_channels, n_samples)`` array.  Only the slice
+        being yielded is read, so lazily-loaded datasets stay on disk.
+    block_size : int
+        Number of samples per channel in each block.  The final block may
+        be shorter.
+    time_axis : int
+        Axis of *data* that indexes samples.  Use ``0`` for time-first
+        arrays such as an NWB ``ElectricalSeries``; blocks are transposed
+        to channels-first either way.
+
+    Yields
+    ------
+    numpy.ndarray
+        ``float64`` block of shape ``(n_channels, <= block_size)``.
+
+    Raises
+    ------
+    ValueError
+        If *block_size* is not positive or *data* is not two-dimensional.
+    """
+    if block_size < 1:
+        raise ValueError(f"block_size must be positive, got {block_size}")
+    if len(data.shape) != 2:
+        raise ValueError(
+            f"data must be (n_channels, n_samples), got shape {data.shape}"
+        )
+    n_samples = data.shape[time_axis]
+    for start in range(0, n_samples, block_size):
+        if time_axis == 0:
+            block = data[start : start + block_size].T
+        else:
+            block = data[:, start : start + block_size]
+        yield np.asarray(block, dtype=float)
+
+
+class StreamingStats:
+    """Running per-channel mean and population variance.
+
+    Blocks are merged with the pairwise update of Chan, Golub & LeVeque,
+    which is numerically stable for long recordings and independent of
+    how the data is split into blocks.
+
+    Parameters
+    ----------
+    n_channels : int
+        Number of channels in every block passed to :meth:`update`.
+
+    Attributes
+    ----------
+    count : int
+        Number of samples per channel seen so far.
+    mean : numpy.ndarray
+        Running mean, shape ``(n_channels,)``.
+    """
+
+    def __init__(self, n_channels: int):
+        self.count = 0
+        self.mean = np.zeros(n_channels)
+        self._m2 = np.zeros(n_channels)
+
+    def update(self, block) -> None:
+        """Fold one ``(n_channels, n_samples)`` block into the totals.
+
+        Parameters
+        ----------
+        block : array-like
+            New samples for every channel.  Empty blocks are ignored.
+
+        Raises
+        ------
+        ValueError
+            If the block's channel count does not match the accumulator.
+        """
+        block = np.asarray(block, dtype=float)
+        if block.ndim != 2 or block.shape[0] != self.mean.shape[0]:
+            raise ValueError(
+                f"expected a ({self.mean.shape[0]}, n) block,"
+                f" got shape {block.shape}"
+            )
+        n_b = block.shape[1]
+        if n_b == 0:
+            return
+        mean_b = block.mean(axis=1)
+        m2_b = ((block - mean_b[:, None]) ** 2).sum(axis=1)
+        n = self.count + n_b
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (n_b / n)
+        self._m2 = self._m2 + m2_b + delta**2 * (self.count * n_b / n)
+        self.count = n
+
+    @property
+    def variance(self) -> np.ndarray:
+        """Population variance per channel.
+
+        Raises
+        ------
+        ZeroDivisionError
+            If no samples have been accumulated, mirroring ``summarize``
+            on an empty channel.
+        """
+        if self.count == 0:
+            raise ZeroDivisionError("no samples accumulated")
+        return self._m2 / self.count
+
+    @property
+    def std(self) -> np.ndarray:
+        """Population standard deviation per channel."""
+        return np.sqrt(self.variance)
+
+
+class StreamingHistogram:
+    """Running per-channel amplitude histogram.
+
+    Counts accumulate into one ``(n_channels, n_bins)`` array.  Shared
+    edges are located with a single :func:`numpy.searchsorted` over the
+    whole block; evenly spaced per-channel edges are located arithmetically.
+    Either way all channels are binned with one :func:`numpy.bincount`.
+
+    As with :func:`numpy.histogram`, bins are half-open except the last,
+    which includes its right edge, and samples outside the edges are not
+    binned.  They are counted per channel in :attr:`underflow` and
+    :attr:`overflow` instead, so clipped or drifting channels still show.
+
+    Parameters
+    ----------
+    n_channels : int
+        Number of channels in every block passed to :meth:`update`.
+    edges : array-like
+        Either one 1-D array of monotonically increasing edges shared by
+        all channels, or an ``(n_channels, n_bins + 1)`` array of evenly
+        spaced per-channel edges (see :meth:`uniform`).
+
+    Attributes
+    ----------
+    counts : numpy.ndarray
+        ``int64`` counts, shape ``(n_channels, n_bins)``.
+    underflow, overflow : numpy.ndarray
+        ``int64`` counts of samples below the first edge and above the
+        last, shape ``(n_channels,)``.
+    edges : numpy.ndarray
+        Bin edges, shape ``(n_channels, n_bins + 1)``.
+    """
+
+    def __init__(self, n_channels: int, edges):
+        edges = np.asarray(edges, dtype=float)
+        self._shared = edges.ndim == 1
+        self.edges = np.broadcast_to(edges, (n_channels, edges.shape[-1]))
+        n_bins = self.edges.shape[1] - 1
+        if n_bins < 1:
+            raise ValueError("need at least two bin edges")
+        if not self._shared:
+            widths = np.diff(self.edges, axis=1)
+            if not np.allclose(widths, widths[:, :1]):
+                raise ValueError("per-channel edges must be evenly spaced")
+        self.counts = np.zeros((n_channels, n_bins), dtype=np.int64)
+        self.underflow = np.zeros(n_channels, dtype=np.int64)
+        self.overflow = np.zeros(n_channels, dtype=np.int64)
+
+    @classmethod
+    def uniform(cls, lo, hi, n_bins: int) -> "StreamingHistogram":
+        """Build a histogram with *n_bins* even bins from *lo* to *hi*.
+
+        Parameters
+        ----------
+        lo, hi : array-like
+            Per-channel lower and upper edges, shape ``(n_channels,)``.
+        n_bins : int
+            Number of bins per channel.
+
+        Returns
+        -------
+        StreamingHistogram
+        """
+        lo = np.asarray(lo, dtype=float)
+        hi = np.asarray(hi, dtype=float)
+        edges = np.linspace(lo, hi, n_bins + 1, axis=1)
+        return cls(len(lo), edges)
+
+    def update(self, block) -> None:
+        """Add the samples of one ``(n_channels, n_samples)`` block.
+
+        Parameters
+        ----------
+        block : array-like
+            New samples for every channel.
+        """
+        block = np.asarray(block, dtype=float)
+        n_channels, n_bins = self.counts.shape
+        lo, hi = self.edges[:, :1], self.edges[:, -1:]
+        if self._shared:
+            idx = np.searchsorted(self.edges[0], block, side="right") - 1
+        else:
+            width = (hi - lo) / n_bins
+            idx = np.floor((block - lo) / width).astype(np.intp)
+        idx[block == hi] = n_bins - 1  # closed last bin
+        # Rounding in the division can put a sample just below hi in bin
+        # n_bins, which would land in the next channel's first bin.
+        np.clip(idx, 0, n_bins - 1, out=idx)
+        below, above = block < lo, block > hi
+        self.underflow += below.sum(axis=1)
+        self.overflow += above.sum(axis=1)
+        valid = ~(below | above | np.isnan(block))
+        flat = np.arange(n_channels)[:, None] * n_bins + idx
+        self.counts += np.bincount(
+            flat[valid], minlength=n_channels * n_bins
+        ).reshape(n_channels, n_bins)
+
+
+class Decimator:
+    """Stateful anti-alias filter and polyphase downsampler.
+
+    Each call to :meth:`process` filters one block with a causal FIR
+    low-pass and keeps every *q*\\ th output, computing only the kept
+    outputs (via :func:`scipy.signal.upfirdn`).  Filter history is
+    carried between calls, so feeding a recording block-by-block gives
+    the same result as filtering it in one piece.
+
+    Parameters
+    ----------
+    n_channels : int
+        Number of channels in every block.
+    q : int
+        Integer decimation factor, e.g. ``15`` for 30 kHz → 2 kHz.
+    taps : array-like, optional
+        FIR filter coefficients.  Defaults to the filter used by
+        :func:`scipy.signal.decimate` with ``ftype="fir"``: a
+        ``20 * q + 1`` tap Hamming-window low-pass at the new Nyquist.
+
+    Notes
+    -----
+    The filter is causal, so the output lags the input by the filter's
+    group delay, ``(len(taps) - 1) / 2`` input samples (10 output
+    samples with the default taps).  The history starts filled with each
+    channel's first sample, i.e. in steady state, so a DC offset does not
+    produce a start-up ramp that would bias the mean and inflate the
+    standard deviation.
+    """
+
+    def __init__(self, n_channels: int, q: int, taps=None):
+        if q < 1:
+            raise ValueError(f"decimation factor must be >= 1, got {q}")
+        self.q = q
+        if taps is None and q == 1:
+            taps = [1.0]
+        elif taps is None:
+            taps = signal.firwin(20 * q + 1, 1.0 / q, window="hamming")
+        self.taps = np.asarray(taps, dtype=float)
+        # Keep enough history for a full filter span plus phase alignment.
+        self._history = np.zeros((n_channels, len(self.taps) + q - 2))
+        self._offset = 0  # input samples consumed so far
+
+    def process(self, block) -> np.ndarray:
+        """Filter and downsample one ``(n_channels, n_samples)`` block.
+
+        Parameters
+        ----------
+        block : array-like
+            Next input samples for every channel.
+
+        Returns
+        -------
+        numpy.ndarray
+            Decimated samples, shape ``(n_channels, m)`` where *m* is the
+            number of output samples falling inside this block.
+        """
+        block = np.asarray(block, dtype=float)
+        n_b = block.shape[1]
+        if self.q == 1:
+            self._offset += n_b
+            return block
+        if self._offset == 0 and n_b:
+            self._history[:] = block[:, :1]  # steady-state start
+
+        # Output m sits at input index m * q; the first one in this block
+        # is `phase` samples in.  Choose a history length `tail` that puts
+        # it on a multiple of q so upfirdn's fixed output grid lines up.
+        phase = -self._offset % self.q
+        min_tail = len(self.taps) - 1
+        tail = min_tail + (-(min_tail + phase) % self.q)
+        history = self._history[:, self._history.shape[1] - tail :]
+        ext = np.concatenate([history, block], axis=1)
+
+        out = signal.upfirdn(self.taps, ext, up=1, down=self.q, axis=1)
+        first = (tail + phase) // self.q
+        n_out = len(range(phase, n_b, self.q))
+        decimated = out[:, first : first + n_out]
+
+        keep = self._history.shape[1]
+        self._history = np.concatenate([self._history, block], axis=1)[
+            :, -keep:
+        ]
+        self._offset += n_b
+        return decimated
+
+
+def summarize_blocks(
+    blocks: Iterable,
+    decimate: int = 1,
+    z_scores: bool = True,
+    bins=None,
+    hist_range: tuple[float, float] | None = None,
+    n_std: float = 5.0,
+):
+    """Summarize a recording supplied as an iterable of blocks.
+
+    Parameters
+    ----------
+    blocks : iterable of array-like
+        Consecutive ``(n_channels, n_samples)`` blocks, e.g. from
+        :func:`iter_blocks`.  Each block is read exactly once.
+    decimate : int
+        Decimation factor applied before the statistics (``1`` = none).
+    z_scores : bool
+        Whether to return z-scores.  The decimated signal must be kept to
+        compute them, so pass ``False`` to hold only the running totals.
+    bins : int or array-like, optional
+        Also accumulate amplitude histograms in the same pass.  A sequence
+        gives fixed edges shared by all channels.  An int gives that many
+        even bins, spanning *hist_range* if set, otherwise each channel's
+        mean ± *n_std* standard deviations, estimated from the first
+        ``MIN_RANGE_SAMPLES`` samples (the blocks are held until then).
+    hist_range : tuple of float, optional
+        ``(lo, hi)`` for integer *bins*, shared by all channels.
+    n_std : float
+        Half-width, in standard deviations, of derived bin ranges.
+
+    Returns
+    -------
+    dict[int, dict]
+        Same layout as ``channel_stats_buggy.summarize``: channel index to
+        ``{"mean", "std", "z_scores"}``, with z-scores as a NumPy array of
+        the (decimated) signal, or ``None`` if *z_scores* is ``False``.
+    counts : numpy.ndarray
+        Only if *bins* is given: ``(n_channels, n_bins)`` histogram counts.
+    edges : numpy.ndarray
+        Only if *bins* is given: ``(n_channels, n_bins + 1)`` bin edges.
+    outside : numpy.ndarray
+        Only if *bins* is given: ``(n_channels, 2)`` counts of samples
+        below the first edge and above the last, which *counts* leaves
+        out.
+
+    Raises
+    ------
+    ValueError
+        If *blocks* is empty.
+    ZeroDivisionError
+        If the blocks contain no samples.
+    """
+    stats = decimator = hist = None
+    kept, held = [], []
+    derived = np.isscalar(bins) and hist_range is None
+    min_samples = MIN_RANGE_SAMPLES if derived else 0
+    for block in blocks:
+        block = np.asarray(block, dtype=float)
+        if stats is None:
+            stats = StreamingStats(block.shape[0])
+            decimator = Decimator(block.shape[0], decimate)
+        block = decimator.process(block)
+        stats.update(block)
+        if hist is not None:
+            hist.update(block)
+        elif bins is not None:
+            held.append(block)
+            if sum(b.shape[1] for b in held) >= min_samples:
+                hist = _make_histogram(held, bins, hist_range, n_std)
+                held = []
+        if z_scores:
+            kept.append(block)
+    if stats is None:
+        raise ValueError("no blocks to summarize")
+
+    mu, sigma = stats.mean, stats.std
+    if held:  # shorter than MIN_RANGE_SAMPLES
+        hist = _make_histogram(held, bins, hist_range, n_std)
+    z = None
+    if z_scores:
+        sig = np.concatenate(kept, axis=1)
+        safe = np.where(sigma == 0.0, 1.0, sigma)
+        z = np.where(
+            sigma[:, None] == 0.0, 0.0, (sig - mu[:, None]) / safe[:, None]
+        )
+    summary = {
+        i: {
+            "mean": float(mu[i]),
+            "std": float(sigma[i]),
+            "z_scores": None if z is None else z[i],
+        }
+        for i in range(len(mu))
+    }
+    if hist is None:
+        return summary
+    outside = np.stack([hist.underflow, hist.overflow], axis=1)
+    return summary, hist.counts, np.array(hist.edges), outside
+
+
+def _make_histogram(first_blocks, bins, hist_range, n_std):
+    """Build the histogram for :func:`summarize_blocks` from its options.
+
+    Derived ranges use the mean and standard deviation of *first_blocks*;
+    flat channels get a unit-wide range centered on their value.  The
+    blocks are added to the returned histogram.
+    """
+    n_channels = first_blocks[0].shape[0]
+    if not np.isscalar(bins):
+        hist = StreamingHistogram(n_channels, bins)
+    elif hist_range is not None:
+        lo, hi = hist_range
+        hist = StreamingHistogram(n_channels, np.linspace(lo, hi, bins + 1))
+    else:
+        sample = np.concatenate(first_blocks, axis=1)
+        mu = sample.mean(axis=1)
+        half = n_std * sample.std(axis=1)
+        half[half == 0.0] = 0.5
+        hist = StreamingHistogram.uniform(mu - half, mu + half, bins)
+    for block in first_blocks:
+        hist.update(block)
+    return hist
+
+
+def summarize(
+    channels,
+    block_size: int = DEFAULT_BLOCK_SIZE,
+    decimate: int = 1,
+    z_scores: bool = True,
+    bins=None,
+    hist_range: tuple[float, float] | None = None,
+    n_std: float = 5.0,
+):
+    """Return summary statistics for each channel, reading in blocks.
+
+    Streaming counterpart of ``channel_stats_buggy.summarize`` for
+    equal-length channels stored as one 2-D array.
+
+    Parameters
+    ----------
+    channels : array-like
+        ``(n_channels, n_samples)`` recording.
+    block_size : int
+        Samples per channel read at a time.
+    decimate : int
+        Decimation factor applied before the statistics.  For 30 kHz
+        data, ``decimate=15`` summarizes the 2 kHz LFP band.
+    z_scores : bool
+        Whether to return z-scores of the (decimated) signal.
+    bins, hist_range, n_std
+        Optional one-pass amplitude histograms; see
+        :func:`summarize_blocks`.
+
+    Returns
+    -------
+    dict[int, dict]
+        See :func:`summarize_blocks`.  With *bins*, a ``(summary, counts,
+        edges, outside)`` tuple.
+    """
+    return summarize_blocks(
+        iter_blocks(channels, block_size),
+        decimate=decimate,
+        z_scores=z_scores,
+        bins=bins,
+        hist_range=hist_range,
+        n_std=n_std,
+    )
+
+
+if __name__ == "__main__":  # pragma: no cover
+    rng = np.random.default_rng(0)
+    fs, q = 30_000, 15
+    t = np.arange(10 * fs) / fs
+    lfp = np.sin(2 * np.pi * 8 * t)  # theta
+    recording = lfp + 0.1 * rng.standard_normal((4, t.size))
+    result = summarize(recording, decimate=q)
+    for ch, stats in result.items():
+        print(
+            f"Channel {ch}: mean={stats['mean']:.3f}, std={stats['std']:.3f},"
+            f" n={stats['z_scores'].size}"
+        )
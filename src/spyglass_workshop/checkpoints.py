@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""On-disk checkpoint cache for large Fibonacci numbers.
+
+:func:`spyglass_workshop.fibonacci.enable_cache` stores pairs
+``(F(k), F(k + 1))`` here so that later calls, in this process or
+another, start from a nearby checkpoint instead of from scratch:
+
+- a repeated index is one file read;
+- an index shortly after a stored one is reached by additions;
+- any other index is joined from power-of-two checkpoints, one per set
+  bit, which are computed and saved as needed.
+
+One file per index, named ``fib-<k>.bin``: a little-endian header
+(magic ``FIBK``, format version, byte lengths of both numbers) followed
+by the two numbers as little-endian bytes.
+"""
+
+import bisect
+import contextlib
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+# Checkpoints below 2**CACHE_MIN_BITS are cheaper to recompute than to read.
+CACHE_MIN_BITS = 16
+DEFAULT_CACHE_BYTES = 1 << 30
+
+
+def _add_pairs(x, y) -> tuple[int, int]:
+    """Return ``(F(i + k), F(i + k + 1))`` from ``x = (F(i), F(i + 1))`` and
+    ``y = (F(k), F(k + 1))``.
+
+    Uses ``F(i + k) = F(i) F(k + 1) + F(i + 1) F(k) - F(i) F(k)`` and
+    ``F(i + k + 1) = F(i + 1) F(k + 1) + F(i) F(k)``, in three
+    multiplications.
+    """
+    a, b = x
+    c, d = y
+    ac, bd = a * c, b * d
+    return (a + b) * (c + d) - 2 * ac - bd, bd + ac
+
+
+class CheckpointCache:
+    """On-disk store of Fibonacci pairs ``(F(k), F(k + 1))``.
+
+    Holds the ladder of power-of-two checkpoints ``k = 2**j`` plus every
+    index evaluated through it, one file per index.  Files are written to
+    a temporary name and moved into place with :func:`os.replace`, so
+    readers in other processes see either a whole file or none.  A hit
+    refreshes the file's mtime; once the directory exceeds *max_bytes*
+    the least recently used files are deleted.  A file that vanishes or
+    fails to parse counts as a miss.
+
+    The stored indices and their total size are kept in memory, and the
+    directory is listed again only when its mtime shows that another
+    process has added or removed files.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Cache directory, created if needed.
+    max_bytes : int
+        Size bound for the directory.
+    recurrence : LinearRecurrence
+        The Fibonacci engine, used for ``window``, ``advance`` and its
+        doubling ``threshold``.
+    """
+
+    _HEADER = struct.Struct("<4sBxxxQQ")
+    _MAGIC = b"FIBK"
+    _VERSION = 1
+
+    def __init__(self, path, max_bytes: int, recurrence):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.recurrence = recurrence
+        self._indices: list[int] = []
+        self._bytes = 0
+        self._scanned: int | None = None  # directory mtime at last listing
+
+    def window(self, n: int) -> tuple[int, int]:
+        """Return ``(F(n), F(n + 1))``, starting from the nearest checkpoint.
+
+        Indices below ``2**CACHE_MIN_BITS`` are evaluated directly and not
+        stored.  Otherwise a stored index a short gap below *n* is
+        advanced by additions, with the same break-even gap as
+        :func:`~spyglass_workshop.fibonacci.f_many`, or the pair is joined
+        from the power-of-two checkpoints of n's set bits.  The result is
+        stored for later calls.
+        """
+        if not n >> CACHE_MIN_BITS:
+            return self.recurrence.window(n)
+        pair = self._load(n)
+        if pair is not None:
+            return pair
+        below = self._nearest_below(n)
+        gap = max(self.recurrence.threshold, n**0.6)
+        if below is not None and n - below < gap:
+            pair = self._load(below)
+        if pair is not None:
+            pair = self.recurrence.advance(pair, n - below)
+        else:
+            pair = self.recurrence.window(n & ((1 << CACHE_MIN_BITS) - 1))
+            for j in range(CACHE_MIN_BITS, n.bit_length()):
+                if n >> j & 1:
+                    pair = _add_pairs(pair, self.power(j))
+        self._store(n, *pair)
+        return pair
+
+    def power(self, j: int) -> tuple[int, int]:
+        """Return ``(F(2**j), F(2**j + 1))``, computing and storing misses.
+
+        A miss doubles the next lower checkpoint, so filling the ladder
+        up to *j* costs the same as one fast-doubling evaluation.
+        """
+        pair = self._load(1 << j)
+        if pair is not None:
+            return pair
+        if j <= CACHE_MIN_BITS:
+            pair = self.recurrence.window(1 << j)
+        else:
+            a, b = self.power(j - 1)
+            pair = a * (2 * b - a), a * a + b * b
+        self._store(1 << j, *pair)
+        return pair
+
+    def _file(self, k: int) -> Path:
+        return self.path / f"fib-{k}.bin"
+
+    def _mtime(self) -> int | None:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def _scan(self) -> None:
+        """List the directory if it changed since the last listing."""
+        mtime = self._mtime()
+        if mtime is not None and mtime == self._scanned:
+            return
+        indices, total = [], 0
+        for file in self.path.glob("fib-*.bin"):
+            try:
+                k = int(file.stem[4:])
+                total += file.stat().st_size
+            except (OSError, ValueError):  # removed, or not ours
+                continue
+            indices.append(k)
+        self._indices = sorted(indices)
+        self._bytes = total
+        self._scanned = mtime
+
+    def _nearest_below(self, n: int) -> int | None:
+        """Return the largest stored index below *n*, if any."""
+        self._scan()
+        i = bisect.bisect_left(self._indices, n)
+        return self._indices[i - 1] if i else None
+
+    def _load(self, k: int) -> tuple[int, int] | None:
+        file = self._file(k)
+        try:
+            data = file.read_bytes()
+        except OSError:
+            return None
+        # Refreshing the LRU time may fail on a shared or read-only cache;
+        # the read itself is still a hit.
+        with contextlib.suppress(OSError):
+            os.utime(file)
+        if len(data) < self._HEADER.size:
+            return None
+        magic, version, len_a, len_b = self._HEADER.unpack_from(data)
+        body = memoryview(data)[self._HEADER.size :]
+        if magic != self._MAGIC or version != self._VERSION:
+            return None
+        if len(body) != len_a + len_b:
+            return None
+        a = int.from_bytes(body[:len_a], "little")
+        b = int.from_bytes(body[len_a:], "little")
+        return a, b
+
+    def _store(self, k: int, a: int, b: int) -> None:
+        raw_a = a.to_bytes((a.bit_length() + 7) // 8, "little")
+        raw_b = b.to_bytes((b.bit_length() + 7) // 8, "little")
+        header = self._HEADER.pack(
+            self._MAGIC, self._VERSION, len(raw_a), len(raw_b)
+        )
+        size = len(header) + len(raw_a) + len(raw_b)
+        if size > self.max_bytes:
+            return
+        unchanged = self._mtime() == self._scanned
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(header)
+                fh.write(raw_a)
+                fh.write(raw_b)
+            os.replace(tmp, self._file(k))
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp)
+            raise
+        # Record our own file without relisting, unless another process
+        # touched the directory since our last listing.
+        i = bisect.bisect_left(self._indices, k)
+        if i == len(self._indices) or self._indices[i] != k:
+            self._indices.insert(i, k)
+            self._bytes += size
+        if unchanged:
+            self._scanned = self._mtime()
+        if self._bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for file in self.path.glob("fib-*.bin"):
+            try:
+                st = file.stat()
+            except OSError:  # removed by another process
+                continue
+            entries.append((st.st_mtime, st.st_size, file))
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(OSError):
+                file.unlink()
+            total -= size
+        self._scanned = None  # relist on the next miss
+        self._scan()
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""Batch command-line interface to :mod:`spyglass_workshop.fibonacci`.
+
+Reads whitespace-separated indices from a file or standard input and
+writes one result per index to standard output::
+
+    $ seq 1 5 | fib --format csv
+    n,value
+    1,1
+    2,1
+    ...
+
+Indices are evaluated in batches with ``f_many`` (or ``f_mod_many`` with
+``--mod``), and each batch is written and flushed as soon as it is done,
+so the command works in the middle of a pipeline.  On a bad token, the
+results for the indices before it are still written.  ``--stats``
+reports the throughput in queries per second on standard error.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from spyglass_workshop.fibonacci import f_iter, f_many, f_mod_many, write_int
+
+FORMATS = ("csv", "jsonl", "raw")
+DEFAULT_BATCH_SIZE = 1_024
+
+
+def parse_indices(lines: Iterable[str]) -> Iterator[int]:
+    """Yield the integers in *lines*, any whitespace-separated layout.
+
+    Raises
+    ------
+    ValueError
+        On the first token that is not an integer, naming its line.
+    """
+    for lineno, line in enumerate(lines, 1):
+        for token in line.split():
+            try:
+                yield int(token)
+            except ValueError:
+                raise ValueError(
+                    f"line {lineno}: not an integer: {token!r}"
+                ) from None
+
+
+def _batches(items: Iterable[int], size: int) -> Iterator[list[int]]:
+    """Yield consecutive lists of up to *size* items.
+
+    If *items* raises, the items read before the error are yielded as a
+    last, shorter batch, and the error is raised when the next one is
+    requested.
+    """
+    items = iter(items)
+    while True:
+        batch = []
+        try:
+            for item in itertools.islice(items, size):
+                batch.append(item)
+        except Exception:
+            if batch:
+                yield batch
+            raise
+        if not batch:
+            return
+        yield batch
+
+
+def evaluate(batch: list[int], mod: int | None = None) -> list[int]:
+    """Return ``F(n)``, or ``F(n) % mod``, for every index in *batch*."""
+    if mod is None:
+        return f_many(batch)
+    return [int(v) for v in f_mod_many(batch, mod)]
+
+
+def _terms(n: int, mod: int | None = None) -> Iterator[int]:
+    """Yield ``F(1), ..., F(n)`` (as :func:`f_list`), optionally mod *mod*."""
+    if mod is None:
+        yield from itertools.islice(f_iter(1), max(n, 0))
+        return
+    a, b = 1 % mod, 1 % mod
+    for _ in range(n):
+        yield a
+        a, b = b, (a + b) % mod
+
+
+def write_record(
+    out: TextIO,
+    n: int,
+    values: Iterable[int],
+    fmt: str = "csv",
+    base: int = 10,
+    many: bool = False,
+) -> None:
+    """Write the result for index *n* as one line of *fmt*.
+
+    Parameters
+    ----------
+    out : file-like
+        Destination.
+    n : int
+        The queried index.
+    values : iterable of int
+        A single value, or with *many* the terms of a list query.  Values
+        are streamed with :func:`~spyglass_workshop.fibonacci.write_int`.
+    fmt : {"csv", "jsonl", "raw"}
+        ``csv`` writes ``n,value``; ``jsonl`` writes
+        ``{"n": n, "value": "..."}`` (``"values": [...]`` with *many*),
+        with values as strings so big numbers survive JSON parsers;
+        ``raw`` writes the value alone.  List terms are space-separated
+        in ``csv`` and ``raw``.
+    base : int
+        Output base, as for :func:`~spyglass_workshop.fibonacci.format_int`.
+    many : bool
+        Whether *values* holds a list of terms.
+    """
+    quote = '"' if fmt == "jsonl" else ""
+    sep = ", " if fmt == "jsonl" else " "
+    if fmt == "csv":
+        out.write(f"{n},")
+    elif fmt == "jsonl":
+        key = '"values": [' if many else '"value": '
+        out.write(f'{{"n": {n}, {key}')
+    for i, value in enumerate(values):
+        out.write(f"{sep if i else ''}{quote}")
+        write_int(value, out, base)
+        out.write(quote)
+    if fmt == "jsonl":
+        out.write("]}" if many else "}")
+    out.write("\n")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser for the ``fib`` command."""
+    parser = argparse.ArgumentParser(
+        prog="fib",
+        description="Evaluate Fibonacci numbers for a stream of indices.",
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        default="-",
+        help="file of whitespace-separated indices (default: stdin)",
+    )
+    parser.add_argument(
+        "--format", choices=FORMATS, default="csv", help="output format"
+    )
+    parser.add_argument(
+        "--mod", type=int, help="report F(n) modulo this positive integer"
+    )
+    parser.add_argument(
+        "--base",
+        type=int,
+        choices=(2, 8, 10, 16),
+        default=10,
+        help="output base",
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="output F(1), ..., F(n) for each n instead of F(n)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="indices evaluated and flushed together; 1 for interactive use",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="report queries per second on stderr",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``fib`` command and return its exit status."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.mod is not None and args.mod < 1:
+        parser.error(f"--mod must be positive, got {args.mod}")
+    if args.batch_size < 1:
+        parser.error(f"--batch-size must be positive, got {args.batch_size}")
+
+    try:
+        source = sys.stdin if args.file == "-" else open(args.file)
+    except OSError as err:
+        parser.error(f"cannot open {args.file!r}: {err.strerror}")
+    out = sys.stdout
+    count, start = 0, time.perf_counter()
+    batch: list[int] = []
+    try:
+        if args.format == "csv":
+            out.write("n,values\n" if args.list else "n,value\n")
+        for batch in _batches(parse_indices(source), args.batch_size):
+            if args.list:
+                results = [_terms(n, args.mod) for n in batch]
+            else:
+                results = [[v] for v in evaluate(batch, args.mod)]
+            for n, values in zip(batch, results):
+                write_record(
+                    out, n, values, args.format, args.base, many=args.list
+                )
+            out.flush()
+            count += len(batch)
+    except ValueError as err:
+        print(f"fib: error: {err}", file=sys.stderr)
+        return 1
+    except OverflowError as err:
+        print(f"fib: error: index {max(batch)}: {err}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # The reader went away (e.g. ``| head``): point stdout at devnull
+        # so the interpreter's final flush does not fail again.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, out.fileno())
+        return 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    if args.stats:
+        elapsed = time.perf_counter() - start
+        rate = count / elapsed if elapsed else float("inf")
+        print(
+            f"{count} queries in {elapsed:.3f} s ({rate:,.0f} queries/s)",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
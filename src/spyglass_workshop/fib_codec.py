@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Lossless delta + Fibonacci coding for integer channel data.
+
+Neighboring samples of a raw recording differ by small amounts, so each
+channel is stored as first differences.  Differences are zigzag-mapped to
+positive integers (0, -1, 1, -2, ... → 1, 2, 3, 4, ...) and written with
+the Fibonacci universal code: the Zeckendorf digits of the value,
+least-significant first, followed by an extra ``1``.  Because Zeckendorf
+digits never contain two adjacent ones, ``11`` marks the end of every
+codeword and small values take few bits.
+
+Data is split into blocks of samples.  Every block restarts the delta
+chain and its byte offset is stored in the header, so any block can be
+decoded on its own.
+
+Container layout (little-endian)::
+
+    magic "FIBC" | version u8 | dtype str 3s | n_channels u32
+    n_samples u64 | block_size u32 | n_blocks u32
+    offsets u64 * (n_blocks + 1)   # into the payload
+    payload                        # packed bits, one run per block
+"""
+
+import struct
+from collections.abc import Iterator
+
+import numpy as np
+
+from spyglass_workshop.channel_stats import DEFAULT_BLOCK_SIZE
+from spyglass_workshop.fibonacci import f_array
+
+MAGIC = b"FIBC"
+VERSION = 1
+_HEADER = struct.Struct("<4sB3sIQII")
+
+# Code weights F(2), F(3), ..., F(92): every value below 2**63 fits.
+_FIB = f_array(92)[1:]
+
+
+def _check_dtype(dtype: np.dtype) -> None:
+    """Raise ``TypeError`` unless *dtype* is an integer type of <= 32 bits.
+
+    Deltas of wider types could overflow the 64-bit zigzag mapping.
+    """
+    if dtype.kind not in "iu" or dtype.itemsize > 4:
+        raise TypeError(
+            f"only integer data up to 32 bits can be encoded, got {dtype}"
+        )
+
+
+def _zigzag(d: np.ndarray) -> np.ndarray:
+    """Map signed ``int64`` values to ``uint64``: 0, -1, 1, ... → 0, 1, 2."""
+    return ((d << 1) ^ (d >> 63)).view(np.uint64)
+
+
+def _unzigzag(z: np.ndarray) -> np.ndarray:
+    """Invert :func:`_zigzag`."""
+    half = (z >> np.uint64(1)).view(np.int64)
+    sign = (z & np.uint64(1)).view(np.int64)
+    return half ^ -sign
+
+
+def fib_encode(values: np.ndarray) -> tuple[np.ndarray, int]:
+    """Fibonacci-code an array of positive integers.
+
+    Parameters
+    ----------
+    values : numpy.ndarray
+        One-dimensional ``uint64`` array, every element ``>= 1``.
+
+    Returns
+    -------
+    packed : numpy.ndarray
+        Codewords concatenated and packed into ``uint8`` with
+        :func:`numpy.packbits`.
+    n_bits : int
+        Number of meaningful bits in *packed*.
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    top = np.searchsorted(_FIB, values, side="right") - 1
+    lengths = top + 2  # Zeckendorf digits plus the terminating 1
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    bits = np.zeros(int(ends[-1]) if ends.size else 0, dtype=np.uint8)
+    bits[ends - 1] = 1
+
+    # Greedy Zeckendorf: peel off the largest Fibonacci number each round,
+    # only for the values that still have a remainder.
+    rest, pos, idx = values.copy(), starts, top
+    while rest.size:
+        bits[pos + idx] = 1
+        rest = rest - _FIB[idx]
+        live = rest > 0
+        rest, pos = rest[live], pos[live]
+        idx = np.searchsorted(_FIB, rest, side="right") - 1
+    return np.packbits(bits), bits.size
+
+
+def fib_decode(packed: np.ndarray, n_values: int) -> np.ndarray:
+    """Decode the first *n_values* codewords written by :func:`fib_encode`.
+
+    Parameters
+    ----------
+    packed : numpy.ndarray
+        ``uint8`` packed bit stream.
+    n_values : int
+        Number of codewords to decode.
+
+    Returns
+    -------
+    numpy.ndarray
+        Decoded ``uint64`` values.
+    """
+    if n_values == 0:
+        return np.empty(0, dtype=np.uint64)
+    bits = np.unpackbits(np.asarray(packed, dtype=np.uint8)).astype(bool)
+    ones = np.flatnonzero(bits)
+
+    # A codeword ends at the first "11".  Within a run of ones, the 2nd,
+    # 4th, ... are terminators: each terminator's codeword is complete,
+    # and the next codeword starts with the following bit.
+    is_start = bits[ones].copy()
+    is_start[1:] = ones[1:] != ones[:-1] + 1
+    run_start = np.maximum.accumulate(np.where(is_start, ones, 0))
+    is_term = (ones - run_start) % 2 == 1
+
+    terms = ones[is_term][:n_values]
+    if terms.size < n_values:
+        raise ValueError(f"stream holds {terms.size} of {n_values} values")
+    cw = np.cumsum(is_term) - is_term  # codeword index of every one
+    data = ~is_term & (cw < n_values)
+    cw, data = cw[data], ones[data]
+    cw_start = np.concatenate([[0], terms[:-1] + 1])
+    weights = _FIB[data - cw_start[cw]]
+    # Every codeword has at least one digit, so segments are non-empty.
+    first = np.flatnonzero(np.diff(cw, prepend=-1))
+    return np.add.reduceat(weights, first)
+
+
+def _encode_block(block: np.ndarray) -> bytes:
+    """Delta, zigzag and Fibonacci-code one channels-first block."""
+    deltas = np.diff(block.astype(np.int64), axis=1, prepend=0)
+    packed, _ = fib_encode(_zigzag(deltas.ravel()) + np.uint64(1))
+    return packed.tobytes()
+
+
+def _decode_block(payload: bytes, shape: tuple, dtype: np.dtype):
+    """Invert :func:`_encode_block`."""
+    packed = np.frombuffer(payload, dtype=np.uint8)
+    z = fib_decode(packed, shape[0] * shape[1]) - np.uint64(1)
+    deltas = _unzigzag(z).reshape(shape)
+    return np.cumsum(deltas, axis=1).astype(dtype)
+
+
+def encode(data, block_size: int = DEFAULT_BLOCK_SIZE) -> bytes:
+    """Compress a ``(n_channels, n_samples)`` integer recording.
+
+    Parameters
+    ----------
+    data : array-like
+        Integer samples, channels-first.  Read one block at a time.
+    block_size : int
+        Samples per channel in each independently decodable block.
+
+    Returns
+    -------
+    bytes
+        The encoded container (see module docstring).
+
+    Raises
+    ------
+    TypeError
+        If *data* is not integer or is wider than 32 bits.
+    """
+    dtype = np.dtype(data.dtype)
+    _check_dtype(dtype)
+    n_channels, n_samples = data.shape
+    chunks = [
+        _encode_block(np.asarray(data[:, s : s + block_size]))
+        for s in range(0, n_samples, block_size)
+    ]
+    offsets = np.cumsum([0] + [len(c) for c in chunks], dtype="<u8")
+    header = _HEADER.pack(
+        MAGIC,
+        VERSION,
+        dtype.str.encode(),
+        n_channels,
+        n_samples,
+        block_size,
+        len(chunks),
+    )
+    return header + offsets.tobytes() + b"".join(chunks)
+
+
+class _Container:
+    """Parsed header of an encoded buffer."""
+
+    def __init__(self, buf: bytes):
+        magic, version, dtype, n_ch, n_samp, block, n_blocks = (
+            _HEADER.unpack_from(buf)
+        )
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a Fibonacci-coded channel buffer")
+        self.buf = buf
+        self.dtype = np.dtype(dtype.decode())
+        self.n_channels, self.n_samples = n_ch, n_samp
+        self.block_size, self.n_blocks = block, n_blocks
+        self.offsets = np.frombuffer(
+            buf, dtype="<u8", count=n_blocks + 1, offset=_HEADER.size
+        )
+        self.payload_start = _HEADER.size + self.offsets.nbytes
+
+    def block(self, i: int) -> np.ndarray:
+        if not 0 <= i < self.n_blocks:
+            raise IndexError(f"block {i} out of range ({self.n_blocks})")
+        start = self.payload_start + int(self.offsets[i])
+        stop = self.payload_start + int(self.offsets[i + 1])
+        n = min(self.block_size, self.n_samples - i * self.block_size)
+        return _decode_block(
+            self.buf[start:stop], (self.n_channels, n), self.dtype
+        )
+
+
+def decode_block(buf: bytes, i: int) -> np.ndarray:
+    """Decode block *i* of *buf* without touching the other blocks.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``(n_channels, <= block_size)`` array in the original dtype.
+    """
+    return _Container(buf).block(i)
+
+
+def iter_decoded(buf: bytes) -> Iterator[np.ndarray]:
+    """Yield decoded blocks in order.
+
+    The blocks can be passed straight to
+    :func:`spyglass_workshop.channel_stats.summarize_blocks`, so stats
+    are computed from an archive without decompressing it whole.
+    """
+    container = _Container(buf)
+    for i in range(container.n_blocks):
+        yield container.block(i)
+
+
+def decode(buf: bytes) -> np.ndarray:
+    """Decode a whole buffer written by :func:`encode`."""
+    container = _Container(buf)
+    if container.n_blocks == 0:
+        return np.empty((container.n_channels, 0), dtype=container.dtype)
+    return np.concatenate(list(iter_decoded(buf)), axis=1)
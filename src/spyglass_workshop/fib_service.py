@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""Local asyncio service answering Fibonacci queries.
+
+Clients connect over localhost TCP or a Unix socket and send one query
+per line, ``n`` or ``n m`` for ``F(n) mod m``.  Each is answered with a
+line holding the decimal value, or ``error: ...``, in request order.
+Concurrent queries are handled together by :class:`FibService`:
+
+- identical in-flight queries are coalesced and share one result;
+- queries arriving within a short window are batched into one
+  :func:`~spyglass_workshop.fibonacci.f_many` (or ``f_mod_many``) call;
+- batches with large indices, which need big-integer work, run in a
+  process pool so the event loop keeps serving.
+
+Indices above ``--max-index`` are rejected, since a single huge F(n)
+would hold a pool worker for minutes.  A query that fails only gets an
+error line; the other queries in its batch are answered one by one.
+
+Run a server and measure it with the bundled load generator::
+
+    python -m spyglass_workshop.fib_service serve --port 8765
+    python -m spyglass_workshop.fib_service load --port 8765 --clients 50
+"""
+
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import random
+import sys
+import time
+
+import numpy as np
+
+from spyglass_workshop.fibonacci import f_many, f_mod_many, format_int
+
+# Batches whose largest index is below this are computed on the event loop;
+# F(n) then has under ~700 digits and a process round trip costs more.
+INLINE_LIMIT = 4_096
+
+# Default largest index served without a modulus; F(10**6) takes ~0.1 s.
+MAX_INDEX = 1_000_000
+
+
+def _compute(indices: list[int], mod: int | None) -> list[str]:
+    """Return the decimal answers for one batch; may run in a worker."""
+    if mod is None:
+        return [format_int(v) for v in f_many(indices)]
+    return [str(v) for v in f_mod_many(indices, mod)]
+
+
+class FibService:
+    """Coalescing, batching front end to :mod:`spyglass_workshop.fibonacci`.
+
+    Parameters
+    ----------
+    workers : int, optional
+        Processes for heavy batches; defaults to the CPU count.
+    batch_window : float
+        Seconds to wait for more queries before computing a batch.  With
+        ``0`` a batch holds whatever arrived during one pass of the event
+        loop, which already groups simultaneous clients.
+    max_batch : int
+        Queries that trigger a batch without waiting.
+    max_index : int
+        Largest index accepted without a modulus.  With a modulus the cost
+        is logarithmic, and any index below ``2**64`` is accepted.
+
+    Attributes
+    ----------
+    stats : dict[str, int]
+        ``queries`` received, ``coalesced`` onto an in-flight query,
+        ``batches`` computed and ``offloaded`` to the process pool.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        batch_window: float = 0.0,
+        max_batch: int = 256,
+        max_index: int = MAX_INDEX,
+    ):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_index = max_index
+        self.stats = dict(queries=0, coalesced=0, batches=0, offloaded=0)
+        self._pool = concurrent.futures.ProcessPoolExecutor(workers)
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self._pending: list[tuple] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._clients: dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def query(self, n: int, mod: int | None = None) -> str:
+        """Return ``F(n)``, or ``F(n) % mod``, as a decimal string.
+
+        Raises
+        ------
+        ValueError
+            If *mod* is not positive, or *n* is out of range: negative or
+            ``2**64`` or more with a modulus, above ``max_index`` without.
+        """
+        self.stats["queries"] += 1
+        if mod is not None and (mod < 1 or not 0 <= n < 2**64):
+            raise ValueError(
+                f"need 0 <= n < 2**64 and mod >= 1, got {n} and {mod}"
+            )
+        if mod is None and n > self.max_index:
+            raise ValueError(f"n must be at most {self.max_index}, got {n}")
+        key = (n, mod)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(future)
+        loop = asyncio.get_running_loop()
+        future = self._inflight[key] = loop.create_future()
+        self._pending.append(key)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.batch_window, self._flush)
+        return await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        """Start computing every pending query, one batch per modulus."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        groups: dict[int | None, list[int]] = {}
+        for n, mod in self._pending:
+            groups.setdefault(mod, []).append(n)
+        self._pending = []
+        for mod, indices in groups.items():
+            asyncio.ensure_future(self._run_batch(indices, mod))
+
+    async def _solve(self, indices: list[int], mod: int | None) -> list[str]:
+        """Compute answers inline, or in the pool for large indices."""
+        if mod is None and max(indices) >= INLINE_LIMIT:
+            self.stats["offloaded"] += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._pool, _compute, indices, mod
+            )
+        return _compute(indices, mod)
+
+    async def _run_batch(self, indices: list[int], mod: int | None) -> None:
+        self.stats["batches"] += 1
+        try:
+            answers = await self._solve(indices, mod)
+        except Exception:
+            # Retry one by one so a bad query fails alone, not its batch.
+            for n in indices:
+                future = self._inflight.pop((n, mod))
+                try:
+                    future.set_result((await self._solve([n], mod))[0])
+                except Exception as err:
+                    future.set_exception(err)
+            return
+        for n, answer in zip(indices, answers):
+            self._inflight.pop((n, mod)).set_result(answer)
+
+    async def aclose(self) -> None:
+        """Drop open connections and shut down the process pool."""
+        # Closing the transport ends each handler at EOF; cancelling the
+        # handler tasks instead makes asyncio log their CancelledError.
+        for writer in self._clients.values():
+            writer.close()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+        self._pool.shutdown(cancel_futures=True)
+
+
+def _parse(line: bytes) -> tuple[int, int | None]:
+    """Parse a request line into ``(n, mod)``."""
+    fields = line.split()
+    if len(fields) not in (1, 2):
+        raise ValueError("expected 'n' or 'n m'")
+    n = int(fields[0])
+    mod = int(fields[1]) if len(fields) == 2 else None
+    return n, mod
+
+
+async def _answer(service: FibService, line: bytes) -> bytes:
+    try:
+        answer = await service.query(*_parse(line))
+    except Exception as err:  # reply, and keep the connection serving
+        answer = f"error: {err}"
+    return answer.encode() + b"\n"
+
+
+async def handle_client(
+    service: FibService,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    """Answer a connection's requests concurrently, replying in order."""
+    this = asyncio.current_task()
+    service._clients[this] = writer
+    replies: asyncio.Queue = asyncio.Queue()
+
+    async def send():
+        while (task := await replies.get()) is not None:
+            reply = await task
+            if not writer.is_closing():
+                writer.write(reply)
+                await writer.drain()
+
+    sender = asyncio.ensure_future(send())
+    try:
+        while line := await reader.readline():
+            if line.strip():
+                await replies.put(asyncio.ensure_future(_answer(service, line)))
+    except ConnectionError:
+        pass
+    finally:
+        replies.put_nowait(None)
+        with contextlib.suppress(ConnectionError):
+            await sender
+        writer.close()
+        del service._clients[this]
+
+
+async def start_server(
+    service: FibService,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    path: str | None = None,
+) -> asyncio.AbstractServer:
+    """Start serving *service* on TCP ``host:port``, or a Unix socket."""
+
+    def handler(reader, writer):
+        return handle_client(service, reader, writer)
+
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path)
+    return await asyncio.start_server(handler, host, port)
+
+
+async def _open(host: str, port: int, path: str | None):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def load_test(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    path: str | None = None,
+    clients: int = 20,
+    requests: int = 200,
+    max_index: int = 10_000,
+    hot: float = 0.5,
+    seed: int = 0,
+) -> dict[str, float]:
+    """Measure request latency against a running server.
+
+    Each of *clients* connections sends *requests* queries one at a time
+    and times each round trip.  A fraction *hot* of queries draw from 16
+    popular indices, so coalescing has something to do.
+
+    Returns
+    -------
+    dict[str, float]
+        ``requests``, ``seconds``, ``per_second`` and the ``p50`` and
+        ``p99`` latencies in milliseconds.
+    """
+    rng = random.Random(seed)
+    popular = [rng.randrange(max_index) for _ in range(16)]
+
+    async def client(queries):
+        reader, writer = await _open(host, port, path)
+        latencies = []
+        for n in queries:
+            start = time.perf_counter()
+            writer.write(f"{n}\n".encode())
+            await writer.drain()
+            await reader.readline()
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+        await writer.wait_closed()
+        return latencies
+
+    workloads = [
+        [
+            rng.choice(popular)
+            if rng.random() < hot
+            else rng.randrange(max_index)
+            for _ in range(requests)
+        ]
+        for _ in range(clients)
+    ]
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(w) for w in workloads))
+    elapsed = time.perf_counter() - start
+    latencies = np.concatenate(results) * 1e3
+    return {
+        "requests": latencies.size,
+        "seconds": elapsed,
+        "per_second": latencies.size / elapsed,
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+    }
+
+
+async def _serve_forever(args) -> None:
+    service = FibService(
+        args.workers,
+        args.batch_window,
+        args.max_batch,
+        args.max_index or MAX_INDEX,
+    )
+    server = await start_server(service, args.host, args.port, args.path)
+    where = args.path or "{}:{}".format(*server.sockets[0].getsockname()[:2])
+    print(f"fib service listening on {where}", file=sys.stderr)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.aclose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run ``serve`` or ``load`` from the command line."""
+    parser = argparse.ArgumentParser(prog="fib-service")
+    parser.add_argument("command", choices=("serve", "load"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--path", help="Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--batch-window", type=float, default=0.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--max-index",
+        type=int,
+        help="serve: largest index without a modulus (default 1000000);"
+        " load: largest index queried (default 10000)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":  # pragma: no cover - runs until killed
+        try:
+            asyncio.run(_serve_forever(args))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    report = asyncio.run(
+        load_test(
+            args.host,
+            args.port,
+            args.path,
+            args.clients,
+            args.requests,
+            args.max_index or 10_000,
+        )
+    )
+    print(
+        "{requests} requests in {seconds:.2f} s ({per_second:,.0f}/s);"
+        " latency p50 {p50:.2f} ms, p99 {p99:.2f} ms".format(**report)
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
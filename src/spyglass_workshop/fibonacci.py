@@ -1,19 +1,91 @@
 #!/usr/bin/env python3
-"""Fibonacci numbers."""
+"""Fibonacci numbers.
 
+All functions evaluate the sequence F(0) = 0, F(1) = 1 through one
+engine, :class:`LinearRecurrence`, which loops for small indices and
+switches to polynomial doubling (equivalent to fast doubling) above
+``DOUBLING_THRESHOLD``.
 
-def user_input() -> str:
+- Single values: :func:`f`, :func:`f_mod`, and digit estimates
+  :func:`f_log10`, :func:`f_digits` and :func:`f_leading_digits`.
+- Many values: :func:`f_many`, :func:`f_mod_many`, :func:`f_list`
+  (optionally split over a process pool), :func:`f_array`,
+  :func:`f_iter`, :func:`f_range` and the lazy :class:`FibSequence`.
+- Output: :func:`format_int`, :func:`write_int`, :func:`write_fib` and
+  :func:`write_f_list` stream big numbers without building huge strings.
+- Zeckendorf representations: :func:`zeckendorf_encode` and
+  :func:`zeckendorf_decode` on ``uint64`` bitsets.
+- Tuning: :func:`calibrate` re-measures the doubling threshold and the
+  index from which an installed big-integer backend beats :class:`int`
+  (see :mod:`spyglass_workshop.bigint`), :func:`set_backend` chooses the
+  backend by hand, and :func:`enable_cache` keeps checkpoints on disk
+  (see :mod:`spyglass_workshop.checkpoints`).
+"""
+
+import concurrent.futures
+import decimal
+import functools
+import io
+import itertools
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+from collections import OrderedDict, deque
+from collections.abc import Iterator, Sequence
+from pathlib import Path
+from typing import TextIO
+
+import numpy as np
+
+from spyglass_workshop.bigint import BACKENDS, EXACT, format_native
+from spyglass_workshop.checkpoints import DEFAULT_CACHE_BYTES, CheckpointCache
+
+# Below this index the plain loop beats fast doubling: its additions are
+# cheaper than doubling's multiplications until F(n) outgrows a few machine
+# words.  Measured with ``benchmarks/bench_fibonacci.py`` (crossover
+# ~120-140); ``calibrate()`` re-measures it for the host.
+DOUBLING_THRESHOLD = 128
+
+# Algorithms each function can be forced to use with ``strategy=``.
+STRATEGIES = {
+    "f": ("auto", "iterative", "doubling"),
+    "f_list": ("auto", "iterative", "parallel"),
+}
+
+
+def _check_strategy(func: str, strategy: str) -> None:
+    if strategy not in STRATEGIES[func]:
+        raise ValueError(
+            f"{func} strategy must be one of {STRATEGIES[func]},"
+            f" got {strategy!r}"
+        )
+
+
+def user_input(out: TextIO | None = None, base: int = 10) -> str:
     """Prompt the user for a Fibonacci index and return a formatted result.
 
     Reads one line from standard input, converts it to an integer, and
     returns a human-readable string showing both the *n*\\ th Fibonacci
     number and the full sequence up to that index.
 
+    Parameters
+    ----------
+    out : file-like, optional
+        If given, the message is streamed here with :func:`write_fib`
+        instead of being built in memory, and an empty string is
+        returned.  Use this for large *n*.
+    base : int
+        Output base: 10, or 2, 8 or 16 for raw power-of-two digits.
+
     Returns
     -------
     str
         Message of the form:
-        ``"Fibonacci number N is: X.  The full list is:\\n[...]"``
+        ``"Fibonacci number N is: X.  The full list is:\\n[...]"``,
+        or ``""`` when *out* is given.
 
     Raises
     ------
@@ -29,25 +101,479 @@ def user_input() -> str:
     access call :func:`f` and :func:`f_list` directly.
     """
     try:
-        n = input("Please enter a number: ")
-        return (
-            f"Fibonacci number {n} is: {f(int(n))}. "
-            + f"The full list is:\n{f_list(int(n))}"
-        )
+        n = int(input("Please enter a number: "))
+        if out is not None:
+            write_fib(n, out, base)
+            return ""
+        buf = io.StringIO()
+        write_fib(n, buf, base)
+        return buf.getvalue()
     except Exception as e:
         raise e
 
 
-def f(n: int) -> int:
+def write_fib(n: int, out: TextIO, base: int = 10) -> None:
+    """Stream F(n) and ``f_list(n)`` to *out* in :func:`user_input`'s format.
+
+    Numbers are converted with :func:`format_int` and written one at a
+    time, so the message is never held in memory as one string and there
+    is no ``int_max_str_digits`` limit.  F(n) is computed and formatted
+    in the big-integer backend that :func:`f` would use for *n*.
+
+    Parameters
+    ----------
+    n : int
+        Fibonacci index.
+    out : file-like
+        Text stream with a ``write`` method, e.g. ``sys.stdout``.
+    base : int
+        Output base: 10, or 2, 8 or 16 (written with a ``0b``/``0o``/``0x``
+        prefix).
+    """
+    out.write(f"Fibonacci number {n} is: ")
+    backend = _auto_backend(n)
+    if backend.name == "int" or n < FIBONACCI.threshold:
+        write_int(f(n), out, base)
+    else:
+        write_int(_f_native(n, backend), out, base)
+    out.write(". The full list is:\n[")
+    for i, term in enumerate(f_range(1, n + 1)):
+        if i:
+            out.write(", ")
+        write_int(term, out, base)
+    out.write("]")
+
+
+_PREFIXES = {2: "0b", 8: "0o", 10: "", 16: "0x"}
+
+# Below this many bits the built-in conversion is fast enough.
+_DECIMAL_CUTOFF = 4_096
+
+
+def format_int(x: int, base: int = 10) -> str:
+    """Return the digits of *x* in *base*, in subquadratic time.
+
+    ``str(x)`` is quadratic in the number of digits and, from Python 3.11,
+    refuses ints over ``sys.get_int_max_str_digits()`` digits.  Base 10
+    instead splits *x* in binary, converts the halves recursively to
+    :class:`decimal.Decimal` and recombines them with exact decimal
+    multiplication, as CPython's own ``_pylong`` module does.  Power-of-two
+    bases are linear and use :func:`format`.
+
+    Parameters
+    ----------
+    x : int
+        Integer to format.  Values of a big-integer backend type (see
+        :func:`set_backend`) are formatted natively by that library.
+    base : int
+        10, or 2, 8 or 16.  No prefix is added.
+
+    Returns
+    -------
+    str
+        The digits, with a leading ``-`` for negative *x*.
+
+    Raises
+    ------
+    ValueError
+        For any other base.
+
+    Examples
+    --------
+    >>> format_int(f(100))
+    '354224848179261915075'
+    >>> format_int(255, 16)
+    'ff'
+    """
+    if base not in _PREFIXES:
+        raise ValueError(f"base must be one of {sorted(_PREFIXES)}, got {base}")
+    if not isinstance(x, int):
+        return format_native(x, base)
+    if base != 10:
+        return format(x, {2: "b", 8: "o", 16: "x"}[base])
+    if x.bit_length() <= _DECIMAL_CUTOFF:
+        return str(x)
+    sign, x = ("-", -x) if x < 0 else ("", x)
+    return sign + EXACT.to_sci_string(_int_to_decimal(x))
+
+
+def _int_to_decimal(x: int) -> decimal.Decimal:
+    """Convert a non-negative int to an exact Decimal by binary splitting."""
+    powers: dict[int, decimal.Decimal] = {}
+
+    def pow2(w: int) -> decimal.Decimal:
+        if w not in powers:
+            powers[w] = EXACT.power(decimal.Decimal(2), w)
+        return powers[w]
+
+    def inner(x: int, w: int) -> decimal.Decimal:
+        if w <= _DECIMAL_CUTOFF:
+            return decimal.Decimal(x)
+        half = w >> 1
+        hi = x >> half
+        lo = x - (hi << half)
+        return EXACT.add(
+            EXACT.multiply(inner(hi, w - half), pow2(half)), inner(lo, half)
+        )
+
+    return inner(x, x.bit_length())
+
+
+def write_int(
+    x: int, out: TextIO, base: int = 10, chunk_size: int = 1 << 16
+) -> None:
+    """Write *x* to *out* in *base*, in chunks of *chunk_size* characters.
+
+    Power-of-two bases get a ``0b``/``0o``/``0x`` prefix.  See
+    :func:`format_int`.
+    """
+    digits = format_int(x, base)
+    if digits.startswith("-"):
+        out.write("-")
+        digits = digits[1:]
+    out.write(_PREFIXES[base])
+    for start in range(0, len(digits), chunk_size):
+        out.write(digits[start : start + chunk_size])
+
+
+class LinearRecurrence:
+    """Engine for constant-coefficient linear recurrences.
+
+    Defines ``a(n) = c1 a(n-1) + c2 a(n-2) + ... + ck a(n-k)`` with
+    ``a(0), ..., a(k-1)`` given.  Terms below ``DOUBLING_THRESHOLD * k / 2``
+    are reached by stepping the recurrence.  Beyond that, Kitamasa's method
+    computes ``x**n`` modulo the characteristic polynomial by repeated
+    squaring, O(k² log n) multiplications, and combines the remainder's
+    coefficients with the seeds.  For Fibonacci (k = 2) a squaring step is
+    three multiplications, the same work as fast doubling.
+
+    Parameters
+    ----------
+    coeffs : sequence of int
+        ``(c1, ..., ck)``.
+    seeds : sequence of int
+        ``(a(0), ..., a(k-1))``.
+
+    Raises
+    ------
+    ValueError
+        If *coeffs* is empty or *seeds* has a different length.
+
+    Examples
+    --------
+    >>> lucas = LinearRecurrence((1, 1), (2, 1))
+    >>> [lucas.term(n) for n in range(6)]
+    [2, 1, 3, 4, 7, 11]
+    >>> tribonacci = LinearRecurrence((1, 1, 1), (0, 0, 1))
+    >>> tribonacci.term(30), tribonacci.term_mod(10**18, 10**9 + 7)
+    (15902591, 913728402)
+    """
+
+    def __init__(self, coeffs, seeds):
+        self.coeffs = tuple(int(c) for c in coeffs)
+        self.seeds = tuple(int(s) for s in seeds)
+        k = len(self.coeffs)
+        if k == 0 or len(self.seeds) != k:
+            raise ValueError(
+                f"need k >= 1 coefficients and k seeds, got {k} and"
+                f" {len(self.seeds)}"
+            )
+        self.order = k
+        self.threshold = DOUBLING_THRESHOLD * k // 2
+        # Terms a(0) ... a(2k - 2), enough to rebuild any window.
+        self._ext = self.advance(self.seeds, k - 1, keep=True)
+
+    def __repr__(self) -> str:
+        return f"LinearRecurrence({self.coeffs}, {self.seeds})"
+
+    def __iter__(self) -> Iterator[int]:
+        return self.iter()
+
+    def term(self, n: int) -> int:
+        """Return ``a(n)`` for non-negative *n*."""
+        return self.window(n)[0]
+
+    def window(self, n: int) -> tuple[int, ...]:
+        """Return ``(a(n), ..., a(n + k - 1))``.
+
+        Raises
+        ------
+        ValueError
+            If *n* is negative.
+        """
+        if n < 0:
+            raise ValueError(f"index must be non-negative, got {n}")
+        if n < self.threshold:
+            return self.advance(self.seeds, n)
+        return self._jump(n)
+
+    def _jump(self, n: int, one=1) -> tuple[int, ...]:
+        """Return ``window(n)`` by polynomial doubling at any *n*.
+
+        The arithmetic runs in the type of *one*, e.g. a big-integer
+        backend's (see :mod:`spyglass_workshop.bigint`).
+        """
+        r = self._x_pow(n, one=one)
+        k = self.order
+        return tuple(_dot(r, self._ext[j : j + k]) for j in range(k))
+
+    def term_mod(self, n: int, m: int) -> int:
+        """Return ``a(n) % m``, reducing every intermediate mod *m*."""
+        return self.window_mod(n, m)[0]
+
+    def window_mod(self, n: int, m: int) -> tuple[int, ...]:
+        """Return ``(a(n) % m, ..., a(n + k - 1) % m)``.
+
+        Raises
+        ------
+        ValueError
+            If *n* is negative or *m* is not positive.
+        """
+        if n < 0:
+            raise ValueError(f"index must be non-negative, got {n}")
+        if m < 1:
+            raise ValueError(f"modulus must be positive, got {m}")
+        r = self._x_pow(n, m)
+        k = self.order
+        return tuple(_dot(r, self._ext[j : j + k]) % m for j in range(k))
+
+    def iter(self, start: int = 0) -> Iterator[int]:
+        """Yield ``a(start), a(start + 1), ...`` without end.
+
+        Jumps to *start* with :meth:`window`, then steps the recurrence.
+        """
+        window = self.window(start)
+        if self.coeffs == (1, 1):
+            a, b = window
+            while True:
+                yield a
+                a, b = b, a + b
+        while True:
+            yield window[0]
+            window = self.advance(window, 1)
+
+    def advance(self, window, steps: int, keep: bool = False):
+        """Step a window of k consecutive terms forward *steps* times.
+
+        Parameters
+        ----------
+        window : sequence of int
+            ``(a(i), ..., a(i + k - 1))``.
+        steps : int
+            Number of terms to move forward.
+        keep : bool
+            Return every term visited instead of only the final window.
+
+        Returns
+        -------
+        tuple[int, ...]
+            ``(a(i + steps), ..., a(i + steps + k - 1))``, or with *keep*,
+            ``(a(i), ..., a(i + steps + k - 1))``.
+        """
+        if self.order == 2 and not keep:
+            # Unrolled hot path for Fibonacci-like recurrences.
+            c1, c2 = self.coeffs
+            a, b = window
+            if c1 == c2 == 1:
+                for _ in range(steps):
+                    a, b = b, a + b
+            else:
+                for _ in range(steps):
+                    a, b = b, c1 * b + c2 * a
+            return a, b
+        k = self.order
+        taps = self.coeffs[::-1]  # aligned with the window, oldest first
+        terms = list(window)
+        for _ in range(steps):
+            terms.append(_dot(taps, terms[-k:]))
+        return tuple(terms) if keep else tuple(terms[-k:])
+
+    def _x_pow(self, n: int, m: int | None = None, one=1) -> list[int]:
+        """Return the coefficients of ``x**n`` mod the characteristic poly."""
+        if self.order == 1:
+            c = self.coeffs[0]
+            return [(one * c) ** n if m is None else pow(c, n, m)]
+        if self.order == 2:
+            return self._x_pow2(n, m, one)
+        r = [one] + [one - one] * (self.order - 1)
+        for bit in bin(n)[2:]:
+            r = self._square(r, m)
+            if bit == "1":
+                r = self._times_x(r, m)
+        return r
+
+    def _x_pow2(self, n: int, m: int | None, one=1) -> list[int]:
+        """Unrolled :meth:`_x_pow` for k = 2, using ``x**2 = c1 x + c2``.
+
+        A step is ``r0 + r1 x -> (r0² + c2 r1²) + (2 r0 r1 + c1 r1²) x``:
+        three big multiplications, as in Fibonacci fast doubling.
+        """
+        c1, c2 = self.coeffs
+        r0, r1 = one, one - one
+        for bit in bin(n)[2:]:
+            sq = r1 * r1
+            r0, r1 = r0 * r0 + c2 * sq, 2 * r0 * r1 + c1 * sq
+            if bit == "1":
+                r0, r1 = c2 * r1, r0 + c1 * r1
+            if m is not None:
+                r0, r1 = r0 % m, r1 % m
+        return [r0, r1]
+
+    def _square(self, p, m):
+        """Square a remainder and reduce by ``x**k = sum c_j x**(k-j)``."""
+        k = self.order
+        prod = [0] * (2 * k - 1)
+        for i in range(k):
+            if p[i]:
+                prod[2 * i] += p[i] * p[i]
+                twice = 2 * p[i]
+                for j in range(i + 1, k):
+                    prod[i + j] += twice * p[j]
+        for d in range(2 * k - 2, k - 1, -1):
+            t = prod[d]
+            if m is not None:
+                t %= m
+            if t:
+                for j, c in enumerate(self.coeffs, 1):
+                    if c == 1:
+                        prod[d - j] += t
+                    elif c:
+                        prod[d - j] += t * c
+        if m is not None:
+            return [c % m for c in prod[:k]]
+        return prod[:k]
+
+    def _times_x(self, r, m):
+        """Multiply a remainder by x and reduce."""
+        top = r[-1]
+        out = [0] + r[:-1]
+        for j, c in enumerate(self.coeffs, 1):
+            out[self.order - j] += top * c
+        if m is not None:
+            return [c % m for c in out]
+        return out
+
+
+def _dot(xs, ys) -> int:
+    """Return ``sum(x * y)``, skipping the common 0 and 1 factors."""
+    total = 0
+    for x, y in zip(xs, ys):
+        if y == 1:
+            total += x
+        elif x == 1:
+            total += y
+        elif x and y:
+            total += x * y
+    return total
+
+
+# The Fibonacci sequence F(0) = 0, F(1) = 1 that the functions below use.
+FIBONACCI = LinearRecurrence((1, 1), (0, 1))
+
+
+_BACKEND = BACKENDS["int"]
+
+# From BACKEND_THRESHOLD up, f(n) doubles in _AUTO_BACKEND instead of int;
+# set by calibrate() when an installed backend beats int there.
+BACKEND_THRESHOLD: int | None = None
+_AUTO_BACKEND = None
+
+
+def set_backend(name: str) -> None:
+    """Choose the big-integer type that large Fibonacci numbers use.
+
+    Fast doubling in :func:`f` and :func:`write_fib` runs entirely in the
+    chosen type, including formatting, and results are converted to
+    :class:`int` only when returned.  Any backend other than ``"int"``
+    overrides the calibrated backend crossover (see :func:`calibrate`).
+
+    Parameters
+    ----------
+    name : {"int", "gmpy2", "decimal"}
+        ``"int"`` is the default.  ``"gmpy2"`` needs the optional
+        ``gmpy2`` package; see :mod:`spyglass_workshop.bigint`.
+
+    Raises
+    ------
+    ValueError
+        If the backend is unknown or not installed.
+    """
+    global _BACKEND
+    if name not in BACKENDS:
+        raise ValueError(
+            f"backend must be one of {sorted(BACKENDS)}, got {name!r}"
+        )
+    _BACKEND = BACKENDS[name]
+
+
+def get_backend() -> str:
+    """Return the name of the active big-integer backend."""
+    return _BACKEND.name
+
+
+def _auto_backend(n: int):
+    """Return the backend that ``f(n, "auto")`` doubles in."""
+    if (
+        _BACKEND.name == "int"
+        and _AUTO_BACKEND is not None
+        and n >= BACKEND_THRESHOLD
+    ):
+        return _AUTO_BACKEND
+    return _BACKEND
+
+
+_CACHE: CheckpointCache | None = None
+
+
+def enable_cache(path, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+    """Keep Fibonacci checkpoints in *path* across calls and processes.
+
+    While enabled, :func:`f` serves ``n >= 2**CACHE_MIN_BITS`` (see
+    :mod:`spyglass_workshop.checkpoints`) from stored pairs ``(F(k), F(k + 1))``: a repeated *n* is a file read, an
+    *n* shortly after a stored index is reached by additions, and any
+    other *n* is joined from power-of-two checkpoints, one per set bit,
+    which are computed and saved as needed.
+
+    Parameters
+    ----------
+    path : str or os.PathLike
+        Cache directory, created if needed.  It may be shared by several
+        processes: files are replaced atomically and read whole.
+    max_bytes : int
+        Size bound for the directory.  The least recently used
+        checkpoints are evicted beyond it.
+    """
+    global _CACHE
+    _CACHE = CheckpointCache(path, max_bytes, FIBONACCI)
+
+
+def disable_cache() -> None:
+    """Stop using the checkpoint cache.  Files on disk are kept."""
+    global _CACHE
+    _CACHE = None
+
+
+def f(n: int, strategy: str = "auto") -> int:
     """Return the nth Fibonacci number.
 
-    Uses an iterative two-variable swap — constant memory, no recursion.
+    Evaluated by the shared :data:`FIBONACCI` recurrence engine: an
+    iterative two-variable swap for small *n*, and from
+    ``DOUBLING_THRESHOLD`` up, polynomial doubling (equivalent to fast
+    doubling), which needs only O(log n) big-integer multiplications.
+    From ``BACKEND_THRESHOLD`` up, if :func:`calibrate` found a faster
+    big-integer backend, doubling runs in it.  With :func:`enable_cache`,
+    large *n* start from on-disk checkpoints instead.
 
     Parameters
     ----------
     n : int
         Non-negative position in the Fibonacci sequence.  ``n = 0``
         returns ``0``; ``n = 1`` returns ``1``.
+    strategy : {"auto", "iterative", "doubling"}
+        Force one algorithm instead of choosing by the crossover
+        threshold (see :func:`calibrate`).  The checkpoint cache and the
+        calibrated backend are only used with ``"auto"``; forced doubling
+        runs in the big-integer type chosen with :func:`set_backend`.
 
     Returns
     -------
@@ -57,7 +583,9 @@ def f(n: int) -> int:
     Raises
     ------
     TypeError
-        If *n* is not an integer (the ``range`` call will raise).
+        If *n* is not an integer.
+    ValueError
+        If *strategy* is not one of the above.
 
     Notes
     -----
@@ -65,27 +593,59 @@ def f(n: int) -> int:
 
         F(0) = 0,  F(1) = 1,  F(n) = F(n-1) + F(n-2)
 
-    Negative *n* is silently treated as ``0`` because ``range(n)`` is
-    empty for ``n < 1``.
+    Negative *n* is silently treated as ``0``.
 
     Examples
     --------
     >>> [f(i) for i in range(8)]
     [0, 1, 1, 2, 3, 5, 8, 13]
     """
-    a, b = 0, 1
-    for _ in range(n):
-        a, b = b, a + b
-    return a
+    _check_strategy("f", strategy)
+    if n <= 0:
+        return 0
+    if strategy == "iterative" or (
+        strategy == "auto" and n < FIBONACCI.threshold
+    ):
+        return FIBONACCI.advance(FIBONACCI.seeds, n)[0]
+    if strategy == "auto" and _CACHE is not None:
+        return _CACHE.window(n)[0]
+    backend = _auto_backend(n) if strategy == "auto" else _BACKEND
+    return backend.to_int(_f_native(n, backend))
 
 
-def f_list(n: int) -> list[int]:
+def _f_native(n: int, backend=None):
+    """Return F(n) by doubling, as a value of *backend*'s type.
+
+    *backend* defaults to the active one (see :func:`set_backend`).
+    """
+    backend = backend or _BACKEND
+    with backend.context():
+        return FIBONACCI._jump(n, backend.from_int(1))[0]
+
+
+def _f_in_backend(n: int, name: str) -> int:
+    """Return F(n) by doubling in backend *name*, as :class:`int`."""
+    backend = BACKENDS[name]
+    return backend.to_int(_f_native(n, backend))
+
+
+def f_list(
+    n: int, strategy: str = "auto", workers: int | None = None
+) -> list[int]:
     """Return a list of the first n Fibonacci numbers.
 
     Parameters
     ----------
     n : int
         Number of terms to return.  ``n = 0`` returns an empty list.
+    strategy : {"auto", "iterative", "parallel"}
+        Algorithm; see :func:`crossover_report`.  ``"parallel"`` splits the
+        indices into segments generated in worker processes, each starting
+        from a seed pair computed by fast doubling.  Additions are cheap
+        next to sending the terms back, so parallelism mostly pays off
+        when the workers also format them, as in :func:`write_f_list`.
+    workers : int, optional
+        Worker processes for ``"parallel"``; defaults to the CPU count.
 
     Returns
     -------
@@ -97,6 +657,8 @@ def f_list(n: int) -> list[int]:
     ------
     TypeError
         If *n* is not an integer.
+    ValueError
+        If *strategy* is not one of the above.
 
     Notes
     -----
@@ -111,13 +673,1018 @@ def f_list(n: int) -> list[int]:
     >>> f_list(0)
     []
     """
-    out: list[int] = []
-    a, b = 0, 1
-    for _ in range(n):
-        a, b = b, a + b
-        out.append(a)
+    _check_strategy("f_list", strategy)
+    if strategy == "parallel":
+        out: list[int] = []
+        for terms in _map_segments(_segment, n, workers):
+            out.extend(terms)
+        return out
+    return list(itertools.islice(FIBONACCI.iter(1), max(n, 0)))
+
+
+def write_f_list(
+    n: int,
+    out: TextIO,
+    workers: int | None = None,
+    base: int = 10,
+    sep: str = "\n",
+) -> None:
+    """Write ``f_list(n)`` to *out*, generated and formatted in parallel.
+
+    Worker processes each produce the text of one segment of indices,
+    starting from a fast-doubling seed pair, and segments are written in
+    order as they complete.  Formatting the numbers is most of the work,
+    so this is where extra cores pay off.
+
+    Parameters
+    ----------
+    n : int
+        Number of terms.
+    out : file-like
+        Text stream with a ``write`` method.
+    workers : int, optional
+        Worker processes; defaults to the CPU count.
+    base : int
+        Output base, as for :func:`format_int`.  No prefix is written.
+    sep : str
+        Written after every term.
+    """
+    if base not in _PREFIXES:
+        raise ValueError(f"base must be one of {sorted(_PREFIXES)}, got {base}")
+    for text in _map_segments(_segment_text, n, workers, base, sep):
+        out.write(text)
+
+
+def _segments(n: int, count: int) -> list[tuple[int, int]]:
+    """Split indices ``1..n`` into *count* ``(start, length)`` segments.
+
+    F(i) has O(i) bits, so boundaries at ``n * sqrt(j / count)`` give every
+    segment about the same number of bits to produce.
+    """
+    bounds = sorted({1 + math.isqrt(n * n * j // count) for j in range(count)})
+    bounds.append(n + 1)
+    return [(a, b - a) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _segment(start: int, count: int) -> list[int]:
+    """Return ``F(start), ..., F(start + count - 1)``; runs in a worker."""
+    return list(itertools.islice(FIBONACCI.iter(start), count))
+
+
+def _segment_text(start: int, count: int, base: int, sep: str) -> str:
+    """Return :func:`_segment` formatted, each term followed by *sep*."""
+    buf = io.StringIO()
+    for term in itertools.islice(FIBONACCI.iter(start), count):
+        buf.write(format_int(term, base))
+        buf.write(sep)
+    return buf.getvalue()
+
+
+def _map_segments(func, n: int, workers: int | None, *args) -> Iterator:
+    """Yield ``func(start, count, *args)`` for every segment, in order.
+
+    Runs in a process pool with about four segments per worker, so that
+    uneven segments balance out.  At most two results per worker are
+    held at a time.
+    """
+    workers = workers or os.cpu_count() or 1
+    if n <= 0:
+        return
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        pending: deque = deque()
+        for start, count in _segments(n, 4 * workers):
+            pending.append(pool.submit(func, start, count, *args))
+            if len(pending) > 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def f_array(n: int, dtype=np.uint64) -> np.ndarray:
+    """Return ``f_list(n)`` as a contiguous fixed-width NumPy array.
+
+    Slices a precomputed module-level ``uint64`` table of every Fibonacci
+    number that fits in 64 bits, so repeated calls cost a copy of at most
+    93 elements.
+
+    Parameters
+    ----------
+    n : int
+        Number of terms.  ``n <= 0`` returns an empty array.
+    dtype : numpy dtype
+        Integer dtype of the result.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``[F(1), ..., F(n)]`` with the requested dtype.
+
+    Raises
+    ------
+    TypeError
+        If *dtype* is not an integer type.
+    OverflowError
+        If ``F(n)`` does not fit in *dtype* (e.g. ``n > 93`` for
+        ``uint64``, ``n > 92`` for ``int64``).  Use :func:`f_list` for
+        arbitrary precision.
+
+    Examples
+    --------
+    >>> f_array(8)
+    array([ 1,  1,  2,  3,  5,  8, 13, 21], dtype=uint64)
+    """
+    dtype = np.dtype(dtype)
+    if dtype.kind not in "iu":
+        raise TypeError(f"dtype must be an integer type, got {dtype}")
+    n = max(n, 0)
+    limit = _max_terms(dtype)
+    if n > limit:
+        raise OverflowError(
+            f"F({n}) does not fit in {dtype} (at most {limit} terms);"
+            " use f_list for arbitrary precision"
+        )
+    return _UINT64_TABLE[:n].astype(dtype)
+
+
+@functools.cache
+def _max_terms(dtype: np.dtype) -> int:
+    """Return the largest n such that ``F(n)`` fits in *dtype*."""
+    return int(np.searchsorted(_UINT64_TABLE, np.iinfo(dtype).max, "right"))
+
+
+# Every F(n) below 2**64: F(93) = 12200160415121876738 is the last.
+_UINT64_TABLE = np.array(f_list(93), dtype=np.uint64)
+_UINT64_TABLE.flags.writeable = False
+
+
+# Zeckendorf bit i stands for F(i + 2): 1, 2, 3, 5, ..., F(65).
+_ZECKENDORF_WEIGHTS = _UINT64_TABLE[1:65]
+_ZECKENDORF_BITS = np.left_shift(np.uint64(1), np.arange(64, dtype=np.uint64))
+# Largest sum of non-adjacent weights is F(66) - 1.
+ZECKENDORF_LIMIT = int(_UINT64_TABLE[65])
+# Values below F(26) = 121393 are looked up in a table (~1 MB, built once).
+_ZECKENDORF_TABLE_BITS = 24
+
+
+def _zeckendorf_greedy(values: np.ndarray, floor: int):
+    """Subtract the largest Fibonacci weight from every value >= *floor*.
+
+    Returns the bits collected and the remainders, all below *floor*.
+    Each round handles only the values still at or above *floor*.
+    """
+    bits = np.zeros(values.size, dtype=np.uint64)
+    rest = values.copy()
+    live = np.flatnonzero(rest >= floor)
+    r = rest[live]
+    while live.size:
+        idx = np.searchsorted(_ZECKENDORF_WEIGHTS, r, side="right") - 1
+        bits[live] |= _ZECKENDORF_BITS[idx]
+        r = r - _ZECKENDORF_WEIGHTS[idx]
+        rest[live] = r
+        keep = r >= floor
+        live, r = live[keep], r[keep]
+    return bits, rest
+
+
+@functools.cache
+def _zeckendorf_table() -> np.ndarray:
+    """Return the bitsets of all values below ``F(26)``, indexed by value."""
+    n = int(_ZECKENDORF_WEIGHTS[_ZECKENDORF_TABLE_BITS])
+    table, _ = _zeckendorf_greedy(np.arange(n, dtype=np.uint64), 1)
+    table.flags.writeable = False
+    return table
+
+
+def zeckendorf_encode(values) -> np.ndarray:
+    """Return the Zeckendorf representation of each value as a bitset.
+
+    Every non-negative integer is a unique sum of non-consecutive
+    Fibonacci numbers.  Bit ``i`` of the result is set when ``F(i + 2)`` is
+    in the sum.  The greedy algorithm runs on the whole array at once:
+    each round looks up the largest Fibonacci number not above every
+    remaining value with :func:`numpy.searchsorted`, subtracts it, and
+    continues with only the values that are still large.  Remainders
+    below ``F(26)`` are finished from a precomputed table.
+
+    Parameters
+    ----------
+    values : array-like of int
+        Non-negative integers below ``ZECKENDORF_LIMIT = F(66)``.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint64`` bitsets with the shape of *values*.
+
+    Raises
+    ------
+    TypeError
+        If *values* is not an integer array.
+    ValueError
+        If any value is negative.
+    OverflowError
+        If any value is ``F(66)`` or more and would need a 65th bit.
+
+    Examples
+    --------
+    >>> zeckendorf_encode([0, 1, 4, 100])  # 4 = 3 + 1, 100 = 89 + 8 + 3
+    array([  0,   1,   5, 532], dtype=uint64)
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return np.zeros(values.shape, dtype=np.uint64)
+    if values.dtype.kind not in "iu":
+        raise TypeError(f"values must be integers, got {values.dtype}")
+    if values.min() < 0:
+        raise ValueError("values must be non-negative")
+    if values.max() >= ZECKENDORF_LIMIT:
+        raise OverflowError(
+            f"values must be below F(66) = {ZECKENDORF_LIMIT} to fit 64 bits"
+        )
+    table = _zeckendorf_table()
+    bits, rest = _zeckendorf_greedy(
+        values.astype(np.uint64).ravel(), table.size
+    )
+    bits |= table[rest]
+    return bits.reshape(values.shape)
+
+
+def zeckendorf_decode(bitsets) -> np.ndarray:
+    """Invert :func:`zeckendorf_encode`.
+
+    Parameters
+    ----------
+    bitsets : array-like of int
+        Zeckendorf bitsets, as ``uint64`` or any integer type.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``uint64`` values with the shape of *bitsets*.
+
+    Raises
+    ------
+    ValueError
+        If a bitset has two adjacent bits set, which no Zeckendorf
+        representation has.
+
+    Examples
+    --------
+    >>> zeckendorf_decode(zeckendorf_encode([7, 2024]))
+    array([   7, 2024], dtype=uint64)
+    """
+    bits = np.asarray(bitsets).astype(np.uint64)
+    if np.any(bits & (bits >> np.uint64(1))):
+        raise ValueError("adjacent bits set: not a Zeckendorf representation")
+    out = np.zeros(bits.shape, dtype=np.uint64)
+    top = int(np.bitwise_or.reduce(bits, axis=None)) if bits.size else 0
+    for i in range(top.bit_length()):
+        out += ((bits >> np.uint64(i)) & np.uint64(1)) * _ZECKENDORF_WEIGHTS[i]
     return out
 
 
+def f_many(indices) -> list[int]:
+    """Return ``[f(i) for i in indices]``, sharing work between indices.
+
+    Indices are sorted and deduplicated internally.  Walking them in
+    order, a short gap from the previous index is covered by additions
+    from the previous pair; a long gap starts afresh with fast doubling.
+    The break-even gap grows with the size of the numbers, roughly as
+    ``i ** 0.6`` (measured with ``benchmarks/bench_fibonacci.py``), since
+    one multiplication of big numbers costs many additions.
+
+    Parameters
+    ----------
+    indices : iterable of int
+        Indices in any order, duplicates allowed.  As with :func:`f`,
+        negative indices give ``0``.
+
+    Returns
+    -------
+    list[int]
+        ``F(i)`` for each index, in input order.
+
+    Examples
+    --------
+    >>> f_many([10, 3, 10, 0])
+    [55, 2, 55, 0]
+    """
+    indices = list(indices)
+    values: dict[int, int] = {}
+    k, a, b = 0, 0, 1
+    for i in sorted(set(indices)):
+        if i <= 0:
+            values[i] = 0
+            continue
+        if i - k < max(DOUBLING_THRESHOLD, i**0.6):
+            a, b = FIBONACCI.advance((a, b), i - k)
+        else:
+            a, b = FIBONACCI.window(i)
+        k = i
+        values[i] = a
+    return [values[i] for i in indices]
+
+
+def f_iter(start: int = 0) -> Iterator[int]:
+    """Yield ``F(start), F(start + 1), ...`` without end.
+
+    Jumps to *start* with fast doubling, then advances by addition, so
+    each further term costs one big-integer addition.
+
+    Parameters
+    ----------
+    start : int
+        Index of the first term yielded.
+
+    Yields
+    ------
+    int
+        Consecutive Fibonacci numbers.
+
+    Raises
+    ------
+    ValueError
+        If *start* is negative.
+
+    Examples
+    --------
+    >>> from itertools import islice
+    >>> list(islice(f_iter(10), 4))
+    [55, 89, 144, 233]
+    """
+    if start < 0:
+        raise ValueError(f"start must be non-negative, got {start}")
+    yield from FIBONACCI.iter(start)
+
+
+def f_range(start: int, stop: int, step: int = 1) -> Iterator[int]:
+    """Yield ``F(i)`` for ``i`` in ``range(start, stop, step)``.
+
+    The first term costs O(log start) multiplications; after that each
+    step of 1 is one addition, and larger steps use the addition formula
+    ``F(i + s) = F(i) F(s - 1) + F(i + 1) F(s)``, i.e. a fixed handful of
+    multiplications regardless of *s*.
+
+    Parameters
+    ----------
+    start, stop : int
+        Index range, as for :class:`range`.
+    step : int
+        Positive index increment.
+
+    Yields
+    ------
+    int
+        The selected Fibonacci numbers, in index order.
+
+    Raises
+    ------
+    ValueError
+        If *start* is negative or *step* is not positive.
+
+    Examples
+    --------
+    >>> list(f_range(10, 20, 3))
+    [55, 233, 987, 4181]
+    """
+    if step < 1:
+        raise ValueError(f"step must be positive, got {step}")
+    if start < 0:
+        raise ValueError(f"start must be non-negative, got {start}")
+    count = len(range(start, stop, step))
+    if count == 0:
+        return
+    if step == 1:
+        yield from itertools.islice(FIBONACCI.iter(start), count)
+        return
+    a, b = FIBONACCI.window(start)
+    fs, fs1 = FIBONACCI.window(step)
+    fs0 = fs1 - fs  # F(s - 1)
+    for _ in range(count):
+        yield a
+        a, b = a * fs0 + b * fs, a * fs + b * fs1
+
+
+# Below this index F(n) is computed exactly; it is only a few hundred digits.
+_BINET_CUTOFF = 1_000
+# Guard digits carried beyond those the answer needs, and how close (in
+# units of the last digit) a Binet estimate may come to a rounding
+# boundary before the exact value is used instead.
+_GUARD_DIGITS = 25
+_BOUNDARY_TOL = decimal.Decimal("1e-12")
+
+
+def _log10_fib(n: int, digits: int) -> decimal.Decimal:
+    """Return ``log10(F(n))`` for ``n >= 1`` with *digits* fractional digits.
+
+    From Binet's formula ``F(n) = (phi**n - psi**n) / sqrt(5)``::
+
+        log10 F(n) = n log10(phi) - log10(sqrt(5))
+                     + log10(1 - (-1/phi**2)**n)
+
+    The working precision covers the integer digits of the product plus
+    ``_GUARD_DIGITS``, so the rounding error stays far below the
+    tolerance of the boundary check.
+    """
+    ctx = decimal.Context(
+        prec=len(str(n)) + digits + _GUARD_DIGITS,
+        Emax=decimal.MAX_EMAX,
+        Emin=decimal.MIN_EMIN,
+    )
+    sqrt5 = ctx.sqrt(5)
+    phi = ctx.divide(ctx.add(1, sqrt5), 2)
+    log = ctx.subtract(ctx.multiply(n, ctx.log10(phi)), ctx.log10(sqrt5))
+    ratio = ctx.power(ctx.divide(-1, ctx.multiply(phi, phi)), n)
+    return ctx.add(log, ctx.log10(ctx.subtract(1, ratio)))
+
+
+def _near_integer(x: decimal.Decimal) -> bool:
+    """Return whether *x* is within ``_BOUNDARY_TOL`` of an integer."""
+    frac = x - int(x)
+    return frac < _BOUNDARY_TOL or 1 - frac < _BOUNDARY_TOL
+
+
+def f_log10(n: int) -> float:
+    """Return ``log10(F(n))`` without computing F(n).
+
+    Parameters
+    ----------
+    n : int
+        Positive index.
+
+    Returns
+    -------
+    float
+        The base-10 logarithm, accurate to double precision.
+
+    Raises
+    ------
+    ValueError
+        If ``n < 1``, where ``F(n)`` is ``0``.
+
+    Examples
+    --------
+    >>> f_log10(10**9)
+    208987639.90049374
+    """
+    if n < 1:
+        raise ValueError(f"F({n}) = 0 has no logarithm")
+    if n < _BINET_CUTOFF:
+        return math.log10(f(n))
+    return float(_log10_fib(n, 17))
+
+
+def f_digits(n: int) -> int:
+    """Return the number of decimal digits of F(n) in O(1) big-int work.
+
+    The count is ``floor(log10 F(n)) + 1`` with the logarithm from
+    Binet's formula (see :func:`f_log10`).  If the estimate lies too
+    close to an integer to be sure of the floor, F(n) is computed
+    exactly instead.
+
+    Parameters
+    ----------
+    n : int
+        Index.  As with :func:`f`, ``n <= 0`` gives ``F(n) = 0``, which
+        has one digit.
+
+    Returns
+    -------
+    int
+        ``len(str(f(n)))``.
+
+    Examples
+    --------
+    >>> f_digits(100), len(str(f(100)))
+    (21, 21)
+    >>> f_digits(10**9)
+    208987640
+    """
+    if n < _BINET_CUTOFF:
+        return len(str(f(n)))
+    log = _log10_fib(n, 0)
+    if _near_integer(log):
+        return len(format_int(f(n)))
+    return int(log) + 1
+
+
+def f_leading_digits(n: int, k: int) -> int:
+    """Return the first *k* decimal digits of F(n).
+
+    Raises 10 to the fractional part of ``log10 F(n)`` (see
+    :func:`f_log10`), evaluated with enough precision for *k* digits.  If
+    the result lies too close to a rounding boundary, F(n) is computed
+    exactly instead, so the answer is always correct.
+
+    Parameters
+    ----------
+    n : int
+        Index, as for :func:`f`.
+    k : int
+        Number of leading digits.  If F(n) has at most *k* digits, the
+        whole number is returned.
+
+    Returns
+    -------
+    int
+        The leading digits as an integer.
+
+    Raises
+    ------
+    ValueError
+        If *k* is not positive.
+
+    Examples
+    --------
+    >>> f_leading_digits(100, 5), f(100)
+    (35422, 354224848179261915075)
+    >>> f_leading_digits(10**17, 10)
+    1065227100
+    """
+    if k < 1:
+        raise ValueError(f"k must be positive, got {k}")
+    if n < _BINET_CUTOFF:
+        return int(str(f(n))[:k])
+    if f_digits(n) <= k:
+        return f(n)
+    log = _log10_fib(n, k)
+    whole = int(log)
+    ctx = decimal.Context(prec=k + _GUARD_DIGITS)
+    frac = decimal.Context(prec=len(str(n)) + k + _GUARD_DIGITS).subtract(
+        log, whole
+    )
+    lead = ctx.power(10, ctx.add(frac, k - 1))
+    if _near_integer(lead) or _near_integer(log):
+        return int(format_int(f(n))[:k])
+    return int(lead)
+
+
+def f_mod(n: int, m: int, pisano: bool = False) -> int:
+    """Return ``F(n) mod m`` without computing F(n).
+
+    Uses fast doubling with every intermediate reduced mod *m*, so the
+    cost is O(log n) operations on numbers below *m*.
+
+    Parameters
+    ----------
+    n : int
+        Non-negative index.
+    m : int
+        Positive modulus.
+    pisano : bool
+        Reduce *n* modulo the Pisano period of *m* first.  The period is
+        cached per modulus (see :func:`pisano_period`), which pays off
+        when many queries share one *m*.
+
+    Returns
+    -------
+    int
+        ``F(n) % m``.
+
+    Raises
+    ------
+    ValueError
+        If *n* is negative or *m* is not positive.
+
+    Examples
+    --------
+    >>> f_mod(10, 7), f(10) % 7
+    (6, 6)
+    >>> f_mod(10**18, 10**9 + 7)
+    209783453
+    """
+    if n < 0:
+        raise ValueError(f"n must be non-negative, got {n}")
+    if m < 1:
+        raise ValueError(f"modulus must be positive, got {m}")
+    if pisano:
+        n %= pisano_period(m)
+    return FIBONACCI.term_mod(n, m)
+
+
+def f_mod_many(ns, m: int, pisano: bool = False) -> np.ndarray:
+    """Vectorized :func:`f_mod` over an array of indices.
+
+    For ``m <= 2**32`` all indices are processed together with NumPy
+    ``uint64`` arithmetic, one doubling step per bit of ``max(ns)``.
+    Larger moduli, and indices of ``2**64`` or more, fall back to
+    :func:`f_mod` per index.
+
+    Parameters
+    ----------
+    ns : array-like of int
+        Non-negative integer indices.
+    m : int
+        Positive modulus.
+    pisano : bool
+        Reduce indices modulo the cached Pisano period of *m* first.
+
+    Returns
+    -------
+    numpy.ndarray
+        ``F(ns) % m`` with the shape of *ns*; ``uint64`` for moduli up to
+        ``2**64``, otherwise ``object``.
+
+    Raises
+    ------
+    TypeError
+        If the indices are not integers, e.g. floats.
+    ValueError
+        If any index is negative or *m* is not positive.
+    """
+    if m < 1:
+        raise ValueError(f"modulus must be positive, got {m}")
+    ns = np.asarray(ns)
+    if ns.dtype == object:
+        # Python ints too large for int64/uint64, or mixed input.
+        if not all(
+            isinstance(n, (int, np.integer)) and not isinstance(n, bool)
+            for n in ns.flat
+        ):
+            raise TypeError("indices must be integers")
+    elif ns.size and ns.dtype.kind not in "iu":
+        raise TypeError(f"indices must be integers, got {ns.dtype}")
+    if ns.size and ns.min() < 0:
+        raise ValueError("indices must be non-negative")
+    if m > 2**32 or (ns.size and ns.max() >= 2**64):
+        dtype = np.uint64 if m <= 2**64 else object
+        out = [f_mod(int(n), m, pisano) for n in ns.ravel()]
+        return np.array(out, dtype=dtype).reshape(ns.shape)
+    ns = ns.astype(np.uint64)
+    if pisano:
+        ns = ns % np.uint64(pisano_period(m))
+
+    mod = np.uint64(m)
+    a = np.zeros(ns.shape, dtype=np.uint64)
+    b = np.full(ns.shape, 1 % m, dtype=np.uint64)
+    n_bits = int(ns.max()).bit_length() if ns.size else 0
+    for shift in range(n_bits - 1, -1, -1):
+        # Operands stay below 2**32, so products fit in uint64.
+        c = a * ((2 * b + mod - a) % mod) % mod
+        d = (a * a % mod + b * b % mod) % mod
+        odd = ((ns >> np.uint64(shift)) & np.uint64(1)).astype(bool)
+        a, b = np.where(odd, d, c), np.where(odd, (c + d) % mod, d)
+    return a
+
+
+@functools.lru_cache(maxsize=256)
+def pisano_period(m: int) -> int:
+    """Return the Pisano period of *m*, the period of ``F(n) mod m``.
+
+    Computed from the factorization of *m*: ``pi(m)`` is the lcm of
+    ``pi(p ** k) = p ** (k - 1) * pi(p)`` over its prime powers, and
+    ``pi(p)`` is found among the divisors of ``p - 1`` or ``2 (p + 1)``.
+    Results are cached per modulus.
+
+    Parameters
+    ----------
+    m : int
+        Positive modulus.  Factorization is by trial division, so moduli
+        with two large prime factors (above ~10**14) are slow.
+
+    Returns
+    -------
+    int
+        The period.  ``pi(p ** k) = p ** (k - 1) * pi(p)`` is Wall's
+        conjecture; were it to fail, the result would be a multiple of
+        the period, which is still correct for reducing indices.
+
+    Examples
+    --------
+    >>> pisano_period(10), pisano_period(1000)
+    (60, 1500)
+    """
+    if m < 1:
+        raise ValueError(f"modulus must be positive, got {m}")
+    period = 1
+    for p, k in _factorize(m).items():
+        period = math.lcm(period, _pisano_prime(p) * p ** (k - 1))
+    return period
+
+
+def _pisano_prime(p: int) -> int:
+    """Return the Pisano period of the prime *p*."""
+    if p == 2:
+        return 3
+    if p == 5:
+        return 20
+    period = p - 1 if p % 5 in (1, 4) else 2 * (p + 1)
+    # Shrink the known multiple one prime factor at a time.
+    for q in _factorize(period):
+        while period % q == 0 and FIBONACCI.window_mod(period // q, p) == (
+            0,
+            1,
+        ):
+            period //= q
+    return period
+
+
+def _factorize(m: int) -> dict[int, int]:
+    """Return ``{prime: exponent}`` for *m* by trial division."""
+    factors: dict[int, int] = {}
+    d = 2
+    while d * d <= m:
+        while m % d == 0:
+            factors[d] = factors.get(d, 0) + 1
+            m //= d
+        d += 1 if d == 2 else 2
+    if m > 1:
+        factors[m] = factors.get(m, 0) + 1
+    return factors
+
+
+def _calibration_path() -> Path:
+    """Return the default calibration file, under the user cache dir."""
+    cache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache) / "spyglass_workshop" / "fibonacci.json"
+
+
+# Where the active thresholds came from, for crossover_report.
+_CALIBRATION_SOURCE = "built-in default"
+
+
+def _set_threshold(threshold: int, source: str) -> None:
+    global DOUBLING_THRESHOLD, _CALIBRATION_SOURCE
+    DOUBLING_THRESHOLD = threshold
+    FIBONACCI.threshold = threshold
+    _CALIBRATION_SOURCE = source
+
+
+def _set_backend_threshold(name: str | None, threshold: int | None) -> None:
+    global BACKEND_THRESHOLD, _AUTO_BACKEND
+    if name not in BACKENDS or threshold is None:
+        name = threshold = None
+    BACKEND_THRESHOLD = threshold
+    _AUTO_BACKEND = BACKENDS[name] if name else None
+
+
+def _first_winning(grid: list[int], wins: list[bool]) -> int | None:
+    """Return the smallest grid index from which every point wins."""
+    first = None
+    for n, win in zip(reversed(grid), reversed(wins)):
+        if not win:
+            break
+        first = n
+    return first
+
+
+def calibrate(
+    path=None, save: bool = True, repeat: int = 5
+) -> dict[str, int | str | None]:
+    """Measure the crossovers of :func:`f` on this host and apply them.
+
+    Times both strategies of :func:`f` over a grid of indices and sets
+    ``DOUBLING_THRESHOLD`` to the smallest grid index from which doubling
+    wins everywhere above it.  If doubling loses even at the largest grid
+    index, the threshold is set to twice that index, past the grid, and
+    :func:`crossover_report` says so.
+
+    Then times doubling in every installed big-integer backend against
+    :class:`int` over a grid of large indices, including the conversion
+    of the result to :class:`int`.  The backend that wins from the
+    smallest index on, if any, is used by ``f(n, "auto")`` from that
+    index (``BACKEND_THRESHOLD``) up.
+
+    The result is saved as JSON and loaded automatically when the module
+    is next imported.
+
+    Parameters
+    ----------
+    path : str or os.PathLike, optional
+        Calibration file.  Defaults to
+        ``$XDG_CACHE_HOME/spyglass_workshop/fibonacci.json``.
+    save : bool
+        Write the result to *path*.
+    repeat : int
+        Timing repeats per grid point; the best is used.
+
+    Returns
+    -------
+    dict
+        ``doubling_threshold``, and ``backend`` and ``backend_threshold``
+        (both ``None`` when :class:`int` wins throughout).
+    """
+    grid = [8, 12, 16, 24, 32, 48, 64, 96, 128, 192, 256]
+    wins = []
+    for n in grid:
+        times = {
+            name: min(
+                timeit.repeat(
+                    functools.partial(f, n, name), number=200, repeat=repeat
+                )
+            )
+            for name in ("iterative", "doubling")
+        }
+        wins.append(times["doubling"] < times["iterative"])
+    threshold, note = _first_winning(grid, wins), ""
+    if threshold is None:
+        threshold = 2 * grid[-1]
+        note = f"; doubling lost at every n <= {grid[-1]}"
+
+    big_grid = [2**10, 2**12, 2**14, 2**16, 2**18]
+    times = {
+        name: [
+            min(
+                timeit.repeat(
+                    functools.partial(_f_in_backend, n, name),
+                    number=max(1, 2**16 // n),
+                    repeat=repeat,
+                )
+            )
+            for n in big_grid
+        ]
+        for name in BACKENDS
+    }
+    backend = backend_threshold = None
+    for name in sorted(BACKENDS.keys() - {"int"}):
+        wins = [t < t_int for t, t_int in zip(times[name], times["int"])]
+        first = _first_winning(big_grid, wins)
+        if first is not None and (
+            backend_threshold is None or first < backend_threshold
+        ):
+            backend, backend_threshold = name, first
+    thresholds = {
+        "doubling_threshold": threshold,
+        "backend": backend,
+        "backend_threshold": backend_threshold,
+    }
+    path = Path(path) if path is not None else _calibration_path()
+    if save:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "thresholds": thresholds,
+            "note": note,
+            "machine": platform.machine(),
+            "python": platform.python_version(),
+        }
+        path.write_text(json.dumps(record, indent=2) + "\n")
+    source = f"calibrated ({path})" if save else "calibrated"
+    _set_threshold(threshold, source + note)
+    _set_backend_threshold(backend, backend_threshold)
+    return thresholds
+
+
+def load_calibration(path=None) -> bool:
+    """Apply thresholds saved by :func:`calibrate`.
+
+    Called on import with the default path.  A missing or unreadable file
+    leaves the current thresholds in place.  A backend crossover naming a
+    backend that is not installed here is ignored.
+
+    Returns
+    -------
+    bool
+        Whether a calibration was loaded.
+    """
+    path = Path(path) if path is not None else _calibration_path()
+    try:
+        record = json.loads(path.read_text())
+        thresholds = record["thresholds"]
+        threshold = int(thresholds["doubling_threshold"])
+        backend = thresholds.get("backend")
+        if backend is not None:
+            backend = str(backend)
+        backend_threshold = thresholds.get("backend_threshold")
+        if backend_threshold is not None:
+            backend_threshold = int(backend_threshold)
+        note = str(record.get("note", ""))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        return False
+    _set_threshold(max(threshold, 1), f"calibrated ({path}){note}")
+    _set_backend_threshold(backend, backend_threshold)
+    return True
+
+
+def crossover_report() -> str:
+    """Describe which algorithm each function uses at which sizes.
+
+    Examples
+    --------
+    >>> print(crossover_report())  # doctest: +ELLIPSIS
+    f: iterative for n < ..., doubling from n = ...
+    big integers: ...
+    f_list: iterative; parallel on request
+    thresholds: ...
+    """
+    if _BACKEND.name != "int":
+        integers = f"{_BACKEND.name} (set_backend)"
+    elif _AUTO_BACKEND is None:
+        integers = "int"
+    else:
+        integers = (
+            f"int for n < {BACKEND_THRESHOLD},"
+            f" {_AUTO_BACKEND.name} from n = {BACKEND_THRESHOLD}"
+        )
+    return (
+        f"f: iterative for n < {DOUBLING_THRESHOLD},"
+        f" doubling from n = {DOUBLING_THRESHOLD}\n"
+        f"big integers: {integers}\n"
+        "f_list: iterative; parallel on request\n"
+        f"thresholds: {_CALIBRATION_SOURCE}"
+    )
+
+
+class FibSequence(Sequence):
+    """Lazy, memory-light stand-in for ``f_list(n)``.
+
+    Behaves like the list returned by :func:`f_list` — ``len``, indexing,
+    negative indices, slicing, iteration and ``==`` against lists — but
+    never materializes it.  Seed pairs ``(F(k), F(k + 1))`` are computed by
+    fast doubling every ``isqrt(n)`` indices on first use, and the block
+    of terms after a seed is regenerated by addition on access.  The most
+    recently used blocks are kept in a small LRU cache.
+
+    Parameters
+    ----------
+    n : int
+        Number of terms, as for :func:`f_list`.
+    cache_blocks : int
+        Number of generated blocks to keep.
+
+    Notes
+    -----
+    ``f_list(n)`` holds n integers of up to ~0.7n bits each, O(n²) bits in
+    total.  This object holds at most O(√n) seeds plus *cache_blocks*
+    blocks of O(√n) terms, and random access costs O(√n) additions.
+
+    Examples
+    --------
+    >>> seq = FibSequence(10)
+    >>> seq[0], seq[-1], seq[2:5]
+    (1, 55, [2, 3, 5])
+    >>> seq == f_list(10)
+    True
+    """
+
+    def __init__(self, n: int, cache_blocks: int = 4):
+        self._n = max(n, 0)
+        self._stride = max(math.isqrt(self._n), 1)
+        self._seeds: dict[int, tuple[int, int]] = {}
+        self._blocks: OrderedDict[int, list[int]] = OrderedDict()
+        self._cache_blocks = cache_blocks
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __repr__(self) -> str:
+        return f"FibSequence({self._n})"
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (list, FibSequence)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    def __iter__(self) -> Iterator[int]:
+        return f_range(1, self._n + 1)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._n)
+            if step == 1:
+                return self._run(start, max(stop - start, 0))
+            return [self._item(i) for i in range(start, stop, step)]
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("FibSequence index out of range")
+        return self._item(index)
+
+    def _item(self, index: int) -> int:
+        block, offset = divmod(index, self._stride)
+        return self._block(block)[offset]
+
+    def _block(self, block: int) -> list[int]:
+        """Return terms ``[block * stride, (block + 1) * stride)``."""
+        if block in self._blocks:
+            self._blocks.move_to_end(block)
+            return self._blocks[block]
+        start = block * self._stride
+        if block not in self._seeds:
+            self._seeds[block] = FIBONACCI.window(start + 1)
+        terms = self._run(start, min(self._stride, self._n - start))
+        self._blocks[block] = terms
+        if len(self._blocks) > self._cache_blocks:
+            self._blocks.popitem(last=False)
+        return terms
+
+    def _run(self, start: int, count: int) -> list[int]:
+        """Return *count* consecutive terms from index *start*."""
+        block, offset = divmod(start, self._stride)
+        if offset == 0 and block in self._seeds:
+            a, b = self._seeds[block]
+        else:
+            a, b = FIBONACCI.window(start + 1)
+        out: list[int] = []
+        for _ in range(count):
+            out.append(a)
+            a, b = b, a + b
+        return out
+
+
+load_calibration()
+
 if __name__ == "__main__":  # pragma: no cover
-    print(user_input())
+    user_input(sys.stdout)
+    print()
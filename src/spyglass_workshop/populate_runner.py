@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""Populate one DataJoint table from many processes on many hosts.
+
+Each host starts ``--processes`` workers, and every worker calls
+``populate(reserve_jobs=True)`` on the table, so DataJoint's jobs table
+keeps two workers from computing the same key, across hosts too::
+
+    populate-runner spyglass_workshop.schema_template:MyAnalysis -p 8
+
+With many workers, most of the reservation attempts collide on the same
+few pending keys.  ``--shard`` splits the keys by a hash of their primary
+key instead, so each worker starts on its own slice.  Give every host the
+same ``--hosts`` and its own ``--host-index``::
+
+    populate-runner ... -p 8 --shard --hosts 3 --host-index 0   # host A
+    populate-runner ... -p 8 --shard --hosts 3 --host-index 1   # host B
+
+The keys are split into ``--shards-per-host`` shards per host, by default
+``-p``.  Every host must use the same number of shards, or their slices
+overlap and leave gaps.  Hosts with different ``-p`` should therefore
+all pass the same ``--shards-per-host``, e.g. ``-p 8`` on host A and
+``-p 4`` on host B, both with ``--shards-per-host 8``; host B's workers
+then take two shards each.
+
+A sharded worker that finishes its slice runs one more, unsharded pass,
+so keys left over by a failed or slow worker are still picked up.
+
+Each host prints its workers' combined throughput when they finish;
+``--json`` prints it as JSON so a job script can add up all the hosts.
+The table's module (and so ``datajoint``) is imported only in the
+workers, each of which opens its own database connection.
+"""
+
+import argparse
+import concurrent.futures
+import importlib
+import json
+import multiprocessing
+import socket
+import sys
+import time
+import zlib
+
+DEFAULT_TABLE = "spyglass_workshop.schema_template:MyAnalysis"
+
+# Separator for joining key fields before hashing, unlikely inside a value.
+_SEP = chr(31)
+
+
+def load_table(spec: str) -> type:
+    """Import a table class from ``"package.module:Class"``."""
+    module, _, name = spec.partition(":")
+    if not name:
+        raise ValueError(f"expected 'module:Class', got {spec!r}")
+    table = importlib.import_module(module)
+    for attr in name.split("."):  # allow Master.Part
+        table = getattr(table, attr)
+    return table
+
+
+def shard_restriction(primary_key: list[str], shard: int, n_shards: int) -> str:
+    """Return an SQL restriction selecting one hash shard of the keys.
+
+    Keys are hashed with ``CRC32`` of their primary-key fields joined by
+    a separator; :func:`shard_of` computes the same shard in Python.
+    """
+    if not 0 <= shard < n_shards:
+        raise ValueError(f"need 0 <= shard < {n_shards}, got {shard}")
+    fields = ", ".join(f"`{k}`" for k in primary_key)
+    return f"CRC32(CONCAT_WS(CHAR(31), {fields})) % {n_shards} = {shard}"
+
+
+def shard_of(key: dict, primary_key: list[str], n_shards: int) -> int:
+    """Return the shard of *key*, as selected by :func:`shard_restriction`.
+
+    Matches MySQL for string and integer fields; other types may format
+    differently in SQL.
+    """
+    joined = _SEP.join(str(key[k]) for k in primary_key)
+    return zlib.crc32(joined.encode()) % n_shards
+
+
+def _count(result) -> tuple[int, int]:
+    """Return ``(keys, errors)`` from a ``populate`` return value."""
+    if isinstance(result, dict):  # datajoint >= 0.14.2
+        return result.get("success_count", 0), len(result.get("error_list", []))
+    return 0, len(result or [])
+
+
+def run_worker(
+    spec: str,
+    shard: int | list[int] | None = None,
+    n_shards: int = 1,
+    max_calls: int | None = None,
+) -> dict:
+    """Populate *spec* with job reservation, optionally shards first.
+
+    Each shard in *shard*, one or a list, gets its own pass before the
+    final unsharded one.
+
+    Returns
+    -------
+    dict
+        ``keys`` populated, ``errors`` suppressed and ``seconds`` taken.
+    """
+    table = load_table(spec)()
+    shards = [shard] if isinstance(shard, int) else shard or []
+    passes = [
+        [shard_restriction(table.primary_key, s, n_shards)] for s in shards
+    ]
+    passes.append([])
+    keys = errors = 0
+    start = time.perf_counter()
+    for restrictions in passes:
+        result = table.populate(
+            *restrictions,
+            reserve_jobs=True,
+            suppress_errors=True,
+            order="random",
+            max_calls=None if max_calls is None else max_calls - keys,
+        )
+        done, failed = _count(result)
+        keys += done
+        errors += failed
+        if max_calls is not None and keys >= max_calls:
+            break
+    return {
+        "keys": keys,
+        "errors": errors,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def summarize(workers: list[dict], seconds: float) -> dict:
+    """Combine worker results into one host report."""
+    keys = sum(w["keys"] for w in workers)
+    return {
+        "host": socket.gethostname(),
+        "workers": len(workers),
+        "keys": keys,
+        "errors": sum(w["errors"] for w in workers),
+        "seconds": seconds,
+        "keys_per_second": keys / seconds if seconds else 0.0,
+    }
+
+
+def run(
+    spec: str = DEFAULT_TABLE,
+    processes: int = 1,
+    shard: bool = False,
+    hosts: int = 1,
+    host_index: int = 0,
+    max_calls: int | None = None,
+    shards_per_host: int | None = None,
+) -> dict:
+    """Run *processes* workers on this host and return their summary.
+
+    Parameters
+    ----------
+    spec : str
+        Table to populate, as ``"package.module:Class"``.
+    processes : int
+        Worker processes on this host.
+    shard : bool
+        Start each worker on its own hash shard of the keys.
+    hosts, host_index : int
+        Number of hosts sharing the work and this host's position, so that
+        shards are numbered across all hosts.
+    max_calls : int, optional
+        Keys per worker, as for ``populate``.
+    shards_per_host : int, optional
+        Shards per host, *processes* by default.  Must be the same on
+        every host; the workers take this host's shards round-robin.
+
+    Returns
+    -------
+    dict
+        ``host``, ``workers``, ``keys``, ``errors``, ``seconds`` and
+        ``keys_per_second``.
+    """
+    if processes < 1:
+        raise ValueError(f"processes must be positive, got {processes}")
+    if not 0 <= host_index < hosts:
+        raise ValueError(f"need 0 <= host_index < {hosts}, got {host_index}")
+    per_host = processes if shards_per_host is None else shards_per_host
+    if per_host < 1:
+        raise ValueError(f"shards_per_host must be positive, got {per_host}")
+    n_shards = per_host * hosts if shard else 1
+    first = host_index * per_host
+    shards = [
+        list(range(first + i, first + per_host, processes)) if shard else None
+        for i in range(processes)
+    ]
+    # Spawn, not fork: a forked child would share the parent's connection.
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(
+        processes, mp_context=context
+    ) as pool:
+        futures = [
+            pool.submit(run_worker, spec, s, n_shards, max_calls)
+            for s in shards
+        ]
+        workers = [future.result() for future in futures]
+    return summarize(workers, time.perf_counter() - start)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``populate-runner`` command and return its exit status."""
+    parser = argparse.ArgumentParser(
+        prog="populate-runner",
+        description="Populate a DataJoint table from parallel workers.",
+    )
+    parser.add_argument(
+        "table",
+        nargs="?",
+        default=DEFAULT_TABLE,
+        help=f"table as module:Class (default: {DEFAULT_TABLE})",
+    )
+    parser.add_argument(
+        "-p", "--processes", type=int, default=1, help="workers on this host"
+    )
+    parser.add_argument(
+        "--shard", action="store_true", help="split keys by primary-key hash"
+    )
+    parser.add_argument(
+        "--hosts", type=int, default=1, help="hosts running this command"
+    )
+    parser.add_argument(
+        "--host-index", type=int, default=0, help="this host, 0-based"
+    )
+    parser.add_argument(
+        "--shards-per-host",
+        type=int,
+        help="shards per host, the same on every host (default: -p)",
+    )
+    parser.add_argument("--max-calls", type=int, help="keys per worker")
+    parser.add_argument(
+        "--json", action="store_true", help="print the summary as JSON"
+    )
+    args = parser.parse_args(argv)
+    try:
+        report = run(
+            args.table,
+            args.processes,
+            args.shard,
+            args.hosts,
+            args.host_index,
+            args.max_calls,
+            args.shards_per_host,
+        )
+    except ValueError as err:
+        parser.error(str(err))
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print(
+            "{host}: {workers} workers populated {keys} keys in"
+            " {seconds:.1f} s ({keys_per_second:,.1f} keys/s),"
+            " {errors} errors".format(**report)
+        )
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    sys.exit(main())
@@ -1,11 +1,12 @@
 """Workshop schema template.
 
-This module defines a minimal Spyglass pipeline with four tables:
+This module defines a minimal Spyglass pipeline with five tables:
 
 - ``MyParams``              — parameter lookup table
 - ``MyAnalysisSelection``   — staging table pairing data with parameters
 - ``MyAnalysis``            — computed analysis table
 - ``MyAnalysis.MyPart``     — part table storing per-iteration results
+- ``ChannelStats``          — per-electrode statistics of ``Raw`` data
 
 Each table foreign-key references :class:`spyglass.common.Subject`, which is
 pre-populated in the workshop MySQL instance.
@@ -19,14 +20,28 @@ notebook instructions to populate and query them.
 Exercise
 --------
 Add a ``mean_result : float`` secondary field to ``MyAnalysis`` that stores
-the mean of all ``MyPart.result`` values for that key.  Update ``make``
-accordingly and re-run ``MyAnalysis().populate()``.
+the mean of all ``MyPart.result`` values for that key.  Update
+``MyAnalysis.compute`` accordingly and re-run ``MyAnalysis().populate()``.
 """
 
+import contextlib
+import copy
 import os
+import time
+from collections.abc import Iterator
 
 import datajoint as dj  # type: ignore
-from spyglass.utils import SpyglassMixin, SpyglassMixinPart
+import deepdiff  # type: ignore
+import numpy as np
+from spyglass.common import Electrode, Nwbfile, Raw
+from spyglass.utils import SpyglassMixin, SpyglassMixinPart, logger
+from spyglass.utils.nwb_helper_fn import get_nwb_file
+
+from spyglass_workshop.channel_stats import (
+    DEFAULT_BLOCK_SIZE,
+    StreamingStats,
+    iter_blocks,
+)
 
 this_user = os.getenv("USER", "workshop")
 
@@ -56,7 +71,7 @@ class MySubject(SpyglassMixin, dj.Lookup):
 class MyParams(SpyglassMixin, dj.Lookup):
     """Analysis parameter sets.
 
-    Each row defines one named configuration for ``MyAnalysis.make``.
+    Each row defines one named configuration for ``MyAnalysis.compute``.
     The ``params`` blob stores a dictionary of keyword arguments passed
     directly to the analysis function.
     """
@@ -71,11 +86,166 @@ class MyParams(SpyglassMixin, dj.Lookup):
         ["quick", {"n_iterations": 2, "scale": 0.5}],
     ]
 
+    # Bumped by every insert, update and delete from this process; see
+    # ``ParamsCache``.
+    _version = 0
+
     @classmethod
     def insert_default(cls):
         """Insert the default parameter sets defined in ``contents``."""
         cls().insert(cls.contents, skip_duplicates=True)
 
+    def insert(self, *args, **kwargs):
+        """Insert rows, invalidating any active ``ParamsCache``."""
+        MyParams._version += 1
+        super().insert(*args, **kwargs)
+
+    def update1(self, *args, **kwargs):
+        """Update a row, invalidating any active ``ParamsCache``."""
+        MyParams._version += 1
+        super().update1(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        """Delete rows, invalidating any active ``ParamsCache``."""
+        MyParams._version += 1
+        return super().delete(*args, **kwargs)
+
+    def delete_quick(self, *args, **kwargs):
+        """Delete rows, invalidating any active ``ParamsCache``."""
+        MyParams._version += 1
+        return super().delete_quick(*args, **kwargs)
+
+
+class ParamsCache:
+    """``MyParams`` rows preloaded once and served by ``param_name``.
+
+    ``MyAnalysis.populate`` activates one for the length of the run (see
+    :func:`params_cache`), so the ``make_fetch`` call that precedes each
+    ``make_compute`` no longer issues a ``fetch1`` and blob decode.  The
+    re-check inside the insert transaction still queries, which halves
+    the per-key ``MyParams`` queries rather than removing them.
+
+    The cache reloads when ``MyParams`` changes: at once after an
+    insert, update or delete from this process, on a ``param_name`` it
+    does not hold, on :meth:`invalidate`, and when ``CHECKSUM TABLE``
+    reports a different value.  The checksum is compared at most once
+    every *refresh* seconds, so a change made by another process can go
+    unseen for that long; ``MyAnalysis.make`` recomputes the keys served
+    stale parameters in that window.
+
+    Parameters
+    ----------
+    refresh : float
+        Seconds between checksum comparisons.
+
+    Attributes
+    ----------
+    stats : dict[str, int]
+        ``hits`` served from memory, ``queries`` issued (loads and
+        checksums) and ``reloads`` after a change.
+    """
+
+    def __init__(self, refresh: float = 5.0):
+        self.refresh = refresh
+        self.stats = {"hits": 0, "queries": 0, "reloads": 0}
+        self._rows: dict[str, dict] | None = None
+        self._checksum = None
+        self._checked = 0.0
+        self._version = None
+
+    def _query_checksum(self):
+        self.stats["queries"] += 1
+        table = MyParams()
+        query = f"CHECKSUM TABLE {table.full_table_name}"
+        return table.connection.query(query).fetchone()[1]
+
+    def _load(self, checksum=None) -> None:
+        # Checksum first: a change landing between the two queries then
+        # shows up as a mismatch on the next check, not as a stale cache.
+        if self._rows is not None:
+            self.stats["reloads"] += 1
+        self._version = MyParams._version
+        self._checksum = checksum or self._query_checksum()
+        self._checked = time.monotonic()
+        self.stats["queries"] += 1
+        self._rows = dict(zip(*MyParams.fetch("param_name", "params")))
+
+    def _validate(self) -> None:
+        if self._rows is None or self._version != MyParams._version:
+            self._load()
+        elif time.monotonic() - self._checked >= self.refresh:
+            checksum = self._query_checksum()
+            self._checked = time.monotonic()
+            if checksum != self._checksum:
+                self._load(checksum)
+
+    def invalidate(self) -> None:
+        """Reload the rows on the next :meth:`get`."""
+        self._version = None
+
+    def get(self, param_name: str) -> dict:
+        """Return a copy of the ``params`` blob for *param_name*.
+
+        Raises
+        ------
+        datajoint.DataJointError
+            If no ``MyParams`` row has that name, even after a reload.
+        """
+        self._validate()
+        if param_name not in self._rows:
+            self._load()
+            if param_name not in self._rows:
+                raise dj.DataJointError(f"No MyParams row {param_name!r}")
+        self.stats["hits"] += 1
+        return copy.deepcopy(self._rows[param_name])
+
+    @property
+    def saved(self) -> int:
+        """Queries avoided: one ``fetch1`` per hit, less those issued."""
+        return self.stats["hits"] - self.stats["queries"]
+
+
+_params_cache: ParamsCache | None = None
+
+
+@contextlib.contextmanager
+def params_cache(refresh: float = 5.0) -> Iterator[ParamsCache]:
+    """Serve :func:`get_params` from a :class:`ParamsCache` in this block.
+
+    Nested blocks share the outermost cache, which logs its statistics
+    when it closes.
+    """
+    global _params_cache
+    outer = _params_cache
+    cache = _params_cache = outer or ParamsCache(refresh)
+    try:
+        yield cache
+    finally:
+        _params_cache = outer
+        if outer is None:
+            logger.info(
+                "MyParams cache: {hits} hits, {queries} queries, {reloads}"
+                " reloads; {saved} queries saved".format(
+                    **cache.stats, saved=cache.saved
+                )
+            )
+
+
+def _fetch_hash(fetched: tuple) -> str:
+    """Hash ``make_fetch`` output the way ``populate`` compares it."""
+    return deepdiff.DeepHash(fetched, ignore_iterable_order=False)[fetched]
+
+
+def get_params(param_name: str, cached: bool = True) -> dict:
+    """Return the ``MyParams`` blob for *param_name*.
+
+    Served from the active :class:`ParamsCache`, if any, unless *cached*
+    is False.
+    """
+    if _params_cache is None or not cached:
+        return (MyParams & {"param_name": param_name}).fetch1("params")
+    return _params_cache.get(param_name)
+
 
 @schema
 class MyAnalysisSelection(SpyglassMixin, dj.Manual):
@@ -112,8 +282,23 @@ class MyAnalysisSelection(SpyglassMixin, dj.Manual):
 class MyAnalysis(SpyglassMixin, dj.Computed):
     """Computed analysis results.
 
-    Populated automatically by ``MyAnalysis().populate()``, which calls
-    ``make`` for every unprocessed row in ``MyAnalysisSelection``.
+    Populated automatically by ``MyAnalysis().populate()`` for every
+    unprocessed row in ``MyAnalysisSelection``.  For thousands of rows,
+    ``populate_batched`` does the same work with a few queries per batch
+    instead of several per key.
+
+    ``make`` is split in three (DataJoint >= 0.14.5): ``make_fetch`` reads
+    the inputs, ``make_compute`` runs outside any transaction, and
+    ``make_insert`` writes the rows.  ``populate`` re-runs ``make_fetch``
+    inside the insert transaction and raises if the inputs changed, so
+    locks are held only while inserting, not while computing.
+
+    ``populate`` serves parameters from a :class:`ParamsCache` for the
+    whole run, except in that re-check, which reads ``MyParams`` itself
+    so a change made during the computation is still caught.  If the
+    cache served stale parameters, ``make`` recomputes the key from the
+    ones read in the transaction rather than failing it.  Pass
+    ``cache_params=False`` to query both times.
     """
 
     definition = """
@@ -126,7 +311,7 @@ class MyAnalysis(SpyglassMixin, dj.Computed):
         """Per-iteration results.
 
         One row per iteration of the analysis loop defined in
-        ``MyAnalysis.make``.
+        ``MyAnalysis.compute``.
         """
 
         definition = """
@@ -136,16 +321,99 @@ class MyAnalysis(SpyglassMixin, dj.Computed):
         result    : int                 # result for this iteration
         """
 
-    def make(self, key: dict):
-        """Populate one row of ``MyAnalysis`` and its part table.
+    def make_fetch(self, key: dict) -> tuple[dict]:
+        """Fetch the inputs for one key.
 
         Parameters
         ----------
         key : dict
             Primary key dict provided by ``populate``.  Contains
             ``subject_id`` and ``param_name``.
+
+        Returns
+        -------
+        tuple
+            ``(params,)``, the ``MyParams`` blob for ``key``.  Read
+            from the database, bypassing any :class:`ParamsCache`,
+            inside a transaction, where ``populate`` re-checks inputs.
+        """
+        cached = not self.connection.in_transaction
+        return (get_params(key["param_name"], cached),)
+
+    def make(self, key: dict):
+        """Fetch, compute and insert one key, as DataJoint's tri-part make.
+
+        ``populate`` runs this generator twice: once to fetch and compute,
+        then inside the insert transaction, where it compares the two
+        fetches and sends back the computed rows.  When the first fetch
+        came from a :class:`ParamsCache` that had not yet seen a change to
+        ``MyParams``, the second run invalidates the cache, recomputes
+        from the parameters read in the transaction, and yields the first
+        fetch, so the key is inserted from current parameters instead of
+        failing the comparison.
+        """
+        fetched = self.make_fetch(key)
+        if not self.connection.in_transaction:
+            self._first_fetch = (dict(key), fetched)
+            yield fetched
+            yield self.make_compute(key, *fetched)
+            return
+        first_key, first = getattr(self, "_first_fetch", (None, None))
+        stale = (
+            _params_cache is not None
+            and first_key == key
+            and _fetch_hash(first) != _fetch_hash(fetched)
+        )
+        computed = yield first if stale else fetched
+        if stale:
+            logger.info(f"MyParams changed since cached; recomputing {key}")
+            _params_cache.invalidate()
+            computed = self.make_compute(key, *fetched)
+        self.make_insert(key, *computed)
+        yield
+
+    def make_compute(self, key: dict, params: dict) -> tuple[dict, list]:
+        """Compute the rows for one key, outside the transaction."""
+        return self.compute(key, params)
+
+    def make_insert(self, key: dict, master: dict, part_rows: list[dict]):
+        """Insert the master row first, then parts (DataJoint requirement)."""
+        self.insert1(master)
+        self.MyPart().insert(part_rows)
+
+    def populate(self, *restrictions, cache_params: bool = True, **kwargs):
+        """Run ``populate``, preloading ``MyParams`` once for the run.
+
+        Parameters
+        ----------
+        *restrictions, **kwargs
+            As for ``populate``.
+        cache_params : bool
+            Serve ``make_fetch`` from a :class:`ParamsCache`.
+        """
+        if not cache_params:
+            return super().populate(*restrictions, **kwargs)
+        with params_cache():
+            return super().populate(*restrictions, **kwargs)
+
+    @staticmethod
+    def compute(key: dict, params: dict) -> tuple[dict, list[dict]]:
+        """Return the master row and part rows for one key.
+
+        Parameters
+        ----------
+        key : dict
+            Primary key of the ``MyAnalysis`` row.
+        params : dict
+            The ``MyParams.params`` blob for ``key["param_name"]``.
+
+        Returns
+        -------
+        master : dict
+            Row for ``MyAnalysis``.
+        part_rows : list of dict
+            Rows for ``MyAnalysis.MyPart``.
         """
-        params = (MyParams & key).fetch1("params")
         n_iterations: int = params.get("n_iterations", 5)
         scale: float = params.get("scale", 1.0)
 
@@ -160,9 +428,83 @@ class MyAnalysis(SpyglassMixin, dj.Computed):
             total += result
             part_rows.append({**key, "iteration": i, "result": result})
 
-        # Insert the master row first, then parts (DataJoint requirement).
-        self.insert1({**key, "total_result": total})
-        self.MyPart().insert(part_rows)
+        return {**key, "total_result": total}, part_rows
+
+    def populate_batched(
+        self, *restrictions, batch_size: int = 1_000
+    ) -> dict[str, int]:
+        """Populate pending keys in batches, with bulk queries per batch.
+
+        ``populate`` runs a transaction, a ``fetch1`` of ``MyParams`` and
+        two inserts for every key.  Here each batch of keys costs one
+        ``MyParams`` fetch for all of its parameter sets, one check for
+        keys another worker has finished meanwhile, and one multi-row
+        insert each into the master and part tables, all in one
+        transaction.  As with ``make_fetch``, the parameters are fetched
+        again inside the transaction, and a batch whose parameters changed
+        while it was computed is rolled back.  Any failure rolls back the
+        whole batch.
+
+        Parameters
+        ----------
+        *restrictions
+            Restrict the pending keys, as for ``populate``.
+        batch_size : int
+            Keys computed and inserted per transaction.
+
+        Returns
+        -------
+        dict[str, int]
+            ``keys`` inserted and ``batches`` committed.
+
+        Raises
+        ------
+        datajoint.DataJointError
+            If ``MyParams`` rows used by a batch changed during the run.
+
+        See Also
+        --------
+        spyglass_workshop.utils.count_queries :
+            Measure the SQL statements issued per key.
+        """
+        pending = (self.key_source & dj.AndList(restrictions)) - self
+        keys = pending.fetch("KEY")
+        report = {"keys": 0, "batches": 0}
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start : start + batch_size]
+            used = MyParams & [
+                {"param_name": n} for n in {key["param_name"] for key in batch}
+            ]
+            params = dict(zip(*used.fetch("param_name", "params")))
+            results = [
+                self.compute(key, params[key["param_name"]]) for key in batch
+            ]
+            with self.connection.transaction:
+                if dict(zip(*used.fetch("param_name", "params"))) != params:
+                    raise dj.DataJointError(
+                        "MyParams changed while computing a batch; rerun"
+                    )
+                done = {
+                    tuple(sorted(key.items()))
+                    for key in (self & batch).fetch("KEY")
+                }
+                results = [
+                    (master, part_rows)
+                    for key, (master, part_rows) in zip(batch, results)
+                    if tuple(sorted(key.items())) not in done
+                ]
+                if not results:
+                    continue
+                self.insert(
+                    [master for master, _ in results], allow_direct_insert=True
+                )
+                self.MyPart().insert(
+                    [row for _, part_rows in results for row in part_rows],
+                    allow_direct_insert=True,
+                )
+            report["keys"] += len(results)
+            report["batches"] += 1
+        return report
 
     @staticmethod
     def summarize(key: str | dict) -> dict:
@@ -182,3 +524,98 @@ class MyAnalysis(SpyglassMixin, dj.Computed):
         row = (MyAnalysis & key).fetch1()
         n_parts = len(MyAnalysis.MyPart & key)
         return {**row, "n_parts": n_parts}
+
+
+@schema
+class ChannelStats(SpyglassMixin, dj.Computed):
+    """Per-electrode mean and standard deviation of the raw recording.
+
+    ``make_compute`` streams the NWB ``ElectricalSeries`` in blocks aligned
+    to its HDF5 chunks, so populate memory is bounded by the block size
+    rather than the session length.  As in ``MyAnalysis``, this streaming
+    runs outside the insert transaction; ``make_fetch`` returns only the
+    file path and object id, which ``populate`` re-checks before insert.
+    """
+
+    definition = """
+    -> Raw
+    ---
+    n_samples : bigint unsigned   # samples per electrode
+    """
+
+    class Channel(SpyglassMixinPart, dj.Part):
+        """Statistics for one electrode, in volts."""
+
+        definition = """
+        -> ChannelStats
+        -> Electrode
+        ---
+        mean : float   # mean voltage
+        std  : float   # population standard deviation
+        """
+
+    # Samples per electrode read at a time, rounded up to whole chunks.
+    block_size = DEFAULT_BLOCK_SIZE
+
+    def make_fetch(self, key: dict) -> tuple[str, str]:
+        """Locate the ``Raw`` series for one key.
+
+        Parameters
+        ----------
+        key : dict
+            Primary key dict provided by ``populate``.  Contains
+            ``nwb_file_name``.
+
+        Returns
+        -------
+        tuple
+            ``(nwb_path, raw_object_id)``.
+        """
+        return (
+            Nwbfile.get_abs_path(key["nwb_file_name"]),
+            (Raw & key).fetch1("raw_object_id"),
+        )
+
+    def make_compute(
+        self, key: dict, nwb_path: str, raw_object_id: str
+    ) -> tuple[int, list[dict]]:
+        """Stream the series and return its sample count and part rows."""
+        series = get_nwb_file(nwb_path).objects[raw_object_id]
+        data = series.data
+
+        # Read whole HDF5 chunks so no chunk is decompressed twice.
+        chunks = getattr(data, "chunks", None)
+        chunk_rows = chunks[0] if chunks else 1
+        block = -(-self.block_size // chunk_rows) * chunk_rows
+
+        stats = StreamingStats(data.shape[1])
+        for samples in iter_blocks(data, block, time_axis=0):
+            stats.update(samples)
+
+        electrodes = series.electrodes.to_dataframe()
+        # NWB stores volts as data * channel_conversion * conversion
+        # + offset; the offset moves only the mean.
+        scale = np.full(data.shape[1], float(series.conversion))
+        channel_conversion = getattr(series, "channel_conversion", None)
+        if channel_conversion is not None:
+            scale *= np.asarray(channel_conversion[:], dtype=float)
+        mean = stats.mean * scale + getattr(series, "offset", 0.0)
+        std = stats.std * np.abs(scale)
+        part_rows = [
+            {
+                **key,
+                "electrode_group_name": group_name,
+                "electrode_id": electrode_id,
+                "mean": float(mean[i]),
+                "std": float(std[i]),
+            }
+            for i, (electrode_id, group_name) in enumerate(
+                zip(electrodes.index, electrodes["group_name"])
+            )
+        ]
+        return stats.count, part_rows
+
+    def make_insert(self, key: dict, n_samples: int, part_rows: list[dict]):
+        """Insert the master row, then the per-electrode rows."""
+        self.insert1({**key, "n_samples": n_samples})
+        self.Channel().insert(part_rows)
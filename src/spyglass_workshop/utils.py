@@ -1,9 +1,48 @@
 """Workshop utilities."""
 
+import contextlib
 import os
+from collections.abc import Iterator
 
 # Each attendee gets their own schema namespace in the shared MySQL instance.
 # The instructor grants ALL PRIVILEGES on `workshop_%.*`, so every schema
 # named "workshop_<username>" is writable by the attendee account.
 # Tables declared here will live in e.g. "workshop_alice".
 SCHEMA_PREFIX = os.getenv("USER", "workshop")
+
+
+@contextlib.contextmanager
+def count_queries(connection) -> Iterator[dict[str, int]]:
+    """Count the SQL statements sent through a DataJoint connection.
+
+    Wraps ``connection.query`` for the duration of the block, so fetches,
+    inserts and transaction statements are all counted.
+
+    Parameters
+    ----------
+    connection : datajoint.Connection
+        E.g. ``dj.conn()`` or ``table.connection``.
+
+    Yields
+    ------
+    dict[str, int]
+        ``{"queries": n}``, updated as statements run.
+
+    Examples
+    --------
+    >>> with count_queries(dj.conn()) as counter:  # doctest: +SKIP
+    ...     MyAnalysis.populate()
+    >>> counter["queries"]  # doctest: +SKIP
+    """
+    counter = {"queries": 0}
+    original = connection.query
+
+    def query(*args, **kwargs):
+        counter["queries"] += 1
+        return original(*args, **kwargs)
+
+    connection.query = query
+    try:
+        yield counter
+    finally:
+        connection.query = original
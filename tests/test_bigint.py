@@ -0,0 +1,46 @@
+"""Tests for the big-integer backends."""
+
+import decimal
+import random
+import sys
+
+import pytest
+
+from spyglass_workshop import bigint
+
+
+def test_int_and_decimal_always_available():
+    assert {"int", "decimal"} <= set(bigint.available_backends())
+
+
+@pytest.mark.parametrize("n_digits", [1, 50, 2_048, 2_049, 30_001])
+def test_digits_to_int_round_trip(n_digits):
+    rng = random.Random(n_digits)
+    digits = str(rng.randrange(1, 10)) + "".join(
+        rng.choice("0123456789") for _ in range(n_digits - 1)
+    )
+    value = bigint._digits_to_int(digits)
+    assert value.bit_length() > 3.3 * (n_digits - 1)
+    with decimal.localcontext(bigint.EXACT):
+        assert decimal.Decimal(value) == decimal.Decimal(digits)
+    assert bigint._digits_to_int("-" + digits) == -value
+
+
+@pytest.mark.parametrize(
+    "name", [name for name in bigint.available_backends() if name != "int"]
+)
+@pytest.mark.parametrize("base", [2, 8, 10, 16])
+def test_format_native_matches_format(name, base):
+    backend = bigint.BACKENDS[name]
+    x = 3**500
+    value = backend.from_int(x)
+    code = {2: "b", 8: "o", 10: "d", 16: "x"}[base]
+    assert bigint.format_native(value, base) == format(x, code)
+    assert backend.to_int(value) == x
+
+
+def test_decimal_to_int_beyond_str_limit():
+    limit = getattr(sys, "get_int_max_str_digits", lambda: 0)() or 4_300
+    with decimal.localcontext(bigint.EXACT):
+        value = decimal.Decimal(7) ** (2 * limit)
+    assert bigint._decimal_to_int(value) == 7 ** (2 * limit)
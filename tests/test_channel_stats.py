@@ -0,0 +1,213 @@
+"""Tests for the streaming channel_stats module."""
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from spyglass_workshop.channel_stats import (
+    Decimator,
+    StreamingHistogram,
+    StreamingStats,
+    iter_blocks,
+    summarize,
+    summarize_blocks,
+)
+
+
+@pytest.fixture
+def recording():
+    rng = np.random.default_rng(0)
+    return rng.normal(5.0, 2.0, size=(3, 5_003))
+
+
+def test_iter_blocks_covers_data(recording):
+    blocks = list(iter_blocks(recording, 1_000))
+    assert [b.shape[1] for b in blocks] == [1_000] * 5 + [3]
+    np.testing.assert_array_equal(np.concatenate(blocks, axis=1), recording)
+
+
+def test_iter_blocks_time_first(recording):
+    blocks = list(iter_blocks(recording.T, 1_000, time_axis=0))
+    assert blocks[0].shape == (3, 1_000)
+    np.testing.assert_array_equal(np.concatenate(blocks, axis=1), recording)
+
+
+def test_iter_blocks_rejects_bad_input(recording):
+    with pytest.raises(ValueError, match="block_size"):
+        next(iter_blocks(recording, 0))
+    with pytest.raises(ValueError, match="n_channels"):
+        next(iter_blocks(recording[0], 10))
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 1_000, 10_000])
+def test_streaming_stats_match_numpy(recording, block_size):
+    stats = StreamingStats(3)
+    for block in iter_blocks(recording, block_size):
+        stats.update(block)
+    assert stats.count == recording.shape[1]
+    np.testing.assert_allclose(stats.mean, recording.mean(axis=1))
+    np.testing.assert_allclose(stats.std, recording.std(axis=1))
+
+
+def test_streaming_stats_errors():
+    stats = StreamingStats(2)
+    with pytest.raises(ZeroDivisionError):
+        _ = stats.std
+    with pytest.raises(ValueError, match="expected a"):
+        stats.update(np.zeros((3, 4)))
+
+
+@pytest.mark.parametrize("q", [2, 5, 15])
+@pytest.mark.parametrize("block_size", [97, 1_000])
+def test_decimator_matches_one_shot_filter(recording, q, block_size):
+    dec = Decimator(3, q)
+    streamed = np.concatenate(
+        [dec.process(b) for b in iter_blocks(recording, block_size)], axis=1
+    )
+    # One-shot causal filter started in steady state at the first sample.
+    pad = len(dec.taps) - 1
+    ext = np.concatenate(
+        [np.repeat(recording[:, :1], pad, axis=1), recording], 1
+    )
+    expected = signal.lfilter(dec.taps, 1.0, ext, axis=1)[:, pad::q]
+    np.testing.assert_allclose(streamed, expected, atol=1e-12)
+
+
+def test_decimator_has_no_startup_ramp():
+    fs, q = 30_000, 15
+    rng = np.random.default_rng(2)
+    data = 100.0 + rng.standard_normal((1, 10 * fs))
+    result = summarize(data, decimate=q)
+    assert result[0]["mean"] == pytest.approx(100.0, abs=0.01)
+    # White noise keeps ~1/q of its power below the new Nyquist.
+    assert result[0]["std"] == pytest.approx(np.sqrt(1 / q), rel=0.1)
+    assert summarize(data)[0]["std"] == pytest.approx(1.0, rel=0.01)
+
+
+def test_decimator_identity_when_q_is_one(recording):
+    np.testing.assert_array_equal(Decimator(3, 1).process(recording), recording)
+
+
+def test_summarize_matches_full_pass(recording):
+    result = summarize(recording, block_size=512)
+    for i, ch in enumerate(recording):
+        assert result[i]["mean"] == pytest.approx(ch.mean())
+        assert result[i]["std"] == pytest.approx(ch.std())
+        np.testing.assert_allclose(
+            result[i]["z_scores"], (ch - ch.mean()) / ch.std()
+        )
+
+
+def test_summarize_flat_channel_z_scores_are_zero():
+    result = summarize(np.full((1, 10), 3.0), block_size=4)
+    assert result[0]["std"] == 0.0
+    assert not result[0]["z_scores"].any()
+
+
+def test_summarize_decimated_lfp():
+    fs, q = 30_000, 15
+    t = np.arange(2 * fs) / fs
+    rng = np.random.default_rng(1)
+    # 8 Hz "theta" plus noise above the 1 kHz post-decimation Nyquist.
+    theta = np.sin(2 * np.pi * 8 * t)
+    data = np.vstack([theta, theta + np.sin(2 * np.pi * 5_000 * t)])
+    data += 0.01 * rng.standard_normal(data.shape)
+    result = summarize(data, block_size=4_096, decimate=q)
+    assert result[0]["z_scores"].size == len(range(0, t.size, q))
+    # The anti-alias filter removes the 5 kHz tone.
+    assert result[1]["std"] == pytest.approx(result[0]["std"], rel=0.01)
+
+
+def test_summarize_blocks_without_z_scores(recording):
+    result = summarize_blocks(iter_blocks(recording, 100), z_scores=False)
+    assert result[0]["z_scores"] is None
+
+
+def test_histogram_shared_edges_match_numpy(recording):
+    edges = np.array([-10.0, 0.0, 2.0, 5.0, 8.0, 20.0])
+    hist = StreamingHistogram(3, edges)
+    for block in iter_blocks(recording, 333):
+        hist.update(block)
+    for i, ch in enumerate(recording):
+        np.testing.assert_array_equal(
+            hist.counts[i], np.histogram(ch, edges)[0]
+        )
+
+
+def test_histogram_uniform_per_channel_match_numpy(recording):
+    lo, hi = recording.min(axis=1), recording.max(axis=1) - 1.0
+    hist = StreamingHistogram.uniform(lo, hi, 16)
+    for block in iter_blocks(recording, 333):
+        hist.update(block)
+    for i, ch in enumerate(recording):
+        expected = np.histogram(ch, 16, range=(lo[i], hi[i]))[0]
+        np.testing.assert_array_equal(hist.counts[i], expected)
+
+
+def test_histogram_rejects_uneven_per_channel_edges():
+    with pytest.raises(ValueError, match="evenly spaced"):
+        StreamingHistogram(2, [[0.0, 1.0, 3.0], [0.0, 1.0, 2.0]])
+
+
+def test_summarize_with_fixed_bins(recording):
+    summary, counts, edges, outside = summarize(
+        recording, block_size=512, bins=10, hist_range=(0.0, 10.0)
+    )
+    assert counts.shape == (3, 10)
+    assert edges.shape == (3, 11)
+    assert summary[0]["mean"] == pytest.approx(recording[0].mean())
+    np.testing.assert_array_equal(
+        counts[2], np.histogram(recording[2], 10, range=(0.0, 10.0))[0]
+    )
+    np.testing.assert_array_equal(outside[:, 0], (recording < 0.0).sum(axis=1))
+    np.testing.assert_array_equal(
+        counts.sum(axis=1) + outside.sum(axis=1), recording.shape[1]
+    )
+
+
+def test_summarize_with_derived_bins(recording):
+    _, counts, edges, _ = summarize(recording, block_size=512, bins=20)
+    # mean ± 5 std captures every sample of a normal recording this size.
+    np.testing.assert_array_equal(counts.sum(axis=1), recording.shape[1])
+    np.testing.assert_allclose(edges.mean(axis=1), 5.0, atol=0.2)
+
+
+def test_summarize_derived_bins_keep_samples_beyond_first_block():
+    rng = np.random.default_rng(3)
+    data = rng.standard_normal((2, 1000))
+    _, counts, _, outside = summarize(data, block_size=1, bins=10)
+    np.testing.assert_array_equal(counts.sum(axis=1), [1000, 1000])
+    np.testing.assert_array_equal(outside, 0)
+
+    # A quiet start, then the channel clips at its rails.
+    quiet = 0.01 * rng.standard_normal((2, 2000))
+    clipped = np.tile([-5.0, 5.0], (2, 500))
+    data = np.concatenate([quiet, clipped], axis=1)
+    _, counts, edges, outside = summarize(data, block_size=256, bins=10)
+    assert (edges[:, -1] < 1.0).all()
+    np.testing.assert_array_equal(outside, [[500, 500], [500, 500]])
+    np.testing.assert_array_equal(counts.sum(axis=1), [2000, 2000])
+
+
+def test_histogram_counts_out_of_range_samples():
+    hist = StreamingHistogram(2, [0.0, 1.0, 2.0])
+    hist.update([[-1.0, 0.5, 2.0, 3.0], [np.nan, -2.0, -3.0, 1.5]])
+    np.testing.assert_array_equal(hist.counts, [[1, 1], [0, 1]])
+    np.testing.assert_array_equal(hist.underflow, [1, 2])
+    np.testing.assert_array_equal(hist.overflow, [1, 0])
+
+
+def test_summarize_blocks_empty():
+    with pytest.raises(ValueError, match="no blocks"):
+        summarize_blocks([])
+
+
+def test_histogram_sample_just_below_hi_stays_in_its_channel():
+    lo, hi = np.array([0.139, -7.81]), np.array([7.436, -6.051])
+    hist = StreamingHistogram.uniform(lo, hi, 5)
+    hist.update(np.nextafter(hi, -np.inf)[:, None])
+    np.testing.assert_array_equal(hist.counts, [[0, 0, 0, 0, 1]] * 2)
+
+    hist = StreamingHistogram.uniform([0.13879568], [7.43562049], 11)
+    hist.update([[np.nextafter(7.43562049, -np.inf)]])
+    assert hist.counts[0, -1] == 1 and hist.counts.sum() == 1
@@ -0,0 +1,119 @@
+"""Tests for the fib command-line interface."""
+
+import io
+import json
+
+import pytest
+
+from spyglass_workshop.fib_cli import main, parse_indices
+from spyglass_workshop.fibonacci import f, f_list
+
+
+@pytest.fixture
+def run(monkeypatch, capsys):
+    def run(argv, stdin=""):
+        monkeypatch.setattr("sys.stdin", io.StringIO(stdin))
+        status = main(argv)
+        out, err = capsys.readouterr()
+        return status, out, err
+
+    return run
+
+
+def test_csv_terms(run):
+    status, out, _ = run([], "10\n3 0\n\n200\n")
+    assert status == 0
+    assert out.splitlines() == [
+        "n,value",
+        "10,55",
+        "3,2",
+        "0,0",
+        f"200,{f(200)}",
+    ]
+
+
+@pytest.mark.parametrize("batch_size", ["1", "2", "1024"])
+def test_batches_do_not_change_output(run, batch_size):
+    indices = "\n".join(str(n) for n in [5, 90, 5, 1_000, 7])
+    _, out, _ = run(["--format", "raw", "--batch-size", batch_size], indices)
+    assert out.split() == [str(f(n)) for n in [5, 90, 5, 1_000, 7]]
+
+
+def test_jsonl_list_mod(run):
+    _, out, _ = run(["--format", "jsonl", "--list", "--mod", "7"], "8\n0\n")
+    first, second = (json.loads(line) for line in out.splitlines())
+    assert first == {"n": 8, "values": [str(v % 7) for v in f_list(8)]}
+    assert second == {"n": 0, "values": []}
+
+
+def test_raw_base_and_file(run, tmp_path):
+    path = tmp_path / "indices.txt"
+    path.write_text("10 20\n")
+    _, out, _ = run([str(path), "--format", "raw", "--base", "16"])
+    assert out.split() == [hex(f(10)), hex(f(20))]
+
+
+def test_mod_terms_and_stats(run):
+    _, out, err = run(["--mod", "1000000007", "--stats"], "1000000\n")
+    assert out.splitlines()[1] == f"1000000,{f(1_000_000) % 1_000_000_007}"
+    assert "1 queries" in err and "queries/s" in err
+
+
+def test_bad_input(run):
+    status, out, err = run([], "1\n2\n3 x\n4\n")
+    assert status == 1
+    assert out == "n,value\n1,1\n2,1\n3,2\n"
+    assert "line 3" in err
+    with pytest.raises(SystemExit):
+        run(["--mod", "0"])
+
+
+def test_missing_file(run, tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        run([str(tmp_path / "missing.txt")])
+    assert "cannot open" in capsys.readouterr().err
+
+
+def test_index_beyond_uint64_with_mod(run):
+    status, out, _ = run(["--mod", "7"], f"{2**64}\n")
+    assert status == 0
+    assert out.splitlines()[1] == f"{2**64},0"
+
+
+def test_overflow_is_reported(run, monkeypatch):
+    def overflow(batch, mod=None):
+        raise OverflowError("too big")
+
+    monkeypatch.setattr("spyglass_workshop.fib_cli.evaluate", overflow)
+    status, _, err = run([], "5\n9\n")
+    assert status == 1
+    assert "index 9: too big" in err
+
+
+class ClosedPipe(io.StringIO):
+    """Stdout whose reader has exited, as under ``| head``."""
+
+    def __init__(self, path):
+        super().__init__()
+        self._file = open(path, "w")
+
+    def write(self, text):
+        raise BrokenPipeError
+
+    def fileno(self):
+        return self._file.fileno()
+
+
+def test_broken_pipe_exits_quietly(monkeypatch, capsys, tmp_path):
+    stdout = ClosedPipe(tmp_path / "out")
+    monkeypatch.setattr("sys.stdin", io.StringIO("1\n2\n"))
+    monkeypatch.setattr("sys.stdout", stdout)
+    try:
+        assert main([]) == 1
+    finally:
+        stdout._file.close()
+    assert capsys.readouterr().err == ""
+
+
+def test_parse_indices():
+    assert list(parse_indices(["1  2\n", "\n", "-3"])) == [1, 2, -3]
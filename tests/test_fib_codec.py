@@ -0,0 +1,88 @@
+"""Tests for the delta + Fibonacci channel codec."""
+
+import numpy as np
+import pytest
+
+from spyglass_workshop import fib_codec
+from spyglass_workshop.channel_stats import summarize_blocks
+
+
+@pytest.fixture
+def recording():
+    rng = np.random.default_rng(0)
+    steps = rng.integers(-50, 51, size=(3, 2_500))
+    return np.cumsum(steps, axis=1).astype(np.int16)
+
+
+def test_fib_encode_known_codewords():
+    # 1 → "11", 2 → "011", 3 → "0011", 4 → "1011"
+    packed, n_bits = fib_codec.fib_encode(np.array([1, 2, 3, 4]))
+    bits = np.unpackbits(packed)[:n_bits]
+    assert "".join(map(str, bits)) == "11" + "011" + "0011" + "1011"
+
+
+def test_fib_round_trip_random_values():
+    rng = np.random.default_rng(1)
+    values = rng.integers(1, 2**62, size=5_000, dtype=np.uint64)
+    values[::7] = 1  # runs of "11" codewords
+    packed, _ = fib_codec.fib_encode(values)
+    np.testing.assert_array_equal(
+        fib_codec.fib_decode(packed, values.size), values
+    )
+
+
+def test_fib_decode_short_stream():
+    packed, _ = fib_codec.fib_encode(np.array([5, 6]))
+    with pytest.raises(ValueError, match="2 of 3"):
+        fib_codec.fib_decode(packed, 3)
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.int32, np.uint16])
+def test_round_trip_dtypes(recording, dtype):
+    data = recording.astype(dtype)
+    buf = fib_codec.encode(data, block_size=700)
+    out = fib_codec.decode(buf)
+    assert out.dtype == data.dtype
+    np.testing.assert_array_equal(out, data)
+
+
+def test_extreme_int32_values():
+    info = np.iinfo(np.int32)
+    data = np.array([[info.min, info.max, info.min, 0]], dtype=np.int32)
+    np.testing.assert_array_equal(
+        fib_codec.decode(fib_codec.encode(data)), data
+    )
+
+
+def test_compresses_smooth_data(recording):
+    assert len(fib_codec.encode(recording)) < recording.nbytes / 1.5
+
+
+def test_random_access_block(recording):
+    buf = fib_codec.encode(recording, block_size=1_000)
+    np.testing.assert_array_equal(
+        fib_codec.decode_block(buf, 2), recording[:, 2_000:]
+    )
+    with pytest.raises(IndexError):
+        fib_codec.decode_block(buf, 3)
+
+
+def test_stats_from_decoded_blocks(recording):
+    buf = fib_codec.encode(recording, block_size=512)
+    result = summarize_blocks(fib_codec.iter_decoded(buf))
+    assert result[1]["mean"] == pytest.approx(recording[1].mean())
+    assert result[1]["std"] == pytest.approx(recording[1].std())
+
+
+def test_empty_recording():
+    data = np.zeros((2, 0), dtype=np.int16)
+    assert fib_codec.decode(fib_codec.encode(data)).shape == (2, 0)
+
+
+def test_rejects_unsupported_input():
+    with pytest.raises(TypeError, match="32 bits"):
+        fib_codec.encode(np.zeros((1, 4), dtype=np.int64))
+    with pytest.raises(TypeError, match="32 bits"):
+        fib_codec.encode(np.zeros((1, 4)))
+    with pytest.raises(ValueError, match="not a Fibonacci"):
+        fib_codec.decode(b"\0" * 64)
@@ -0,0 +1,160 @@
+"""Tests for the asyncio Fibonacci query service."""
+
+import asyncio
+
+import pytest
+
+from spyglass_workshop import fib_service
+from spyglass_workshop.fib_service import (
+    INLINE_LIMIT,
+    FibService,
+    load_test,
+    start_server,
+)
+from spyglass_workshop.fibonacci import f
+
+
+def serve(coro_fn, **kwargs):
+    """Run ``coro_fn(service, server)`` against a fresh local server."""
+
+    async def run():
+        service = FibService(workers=1, **kwargs)
+        server = await start_server(service)
+        try:
+            return await coro_fn(service, server)
+        finally:
+            server.close()
+            await service.aclose()
+            await server.wait_closed()
+
+    return asyncio.run(run())
+
+
+async def roundtrip(server, lines):
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write("".join(f"{line}\n" for line in lines).encode())
+    await writer.drain()
+    count = sum(1 for line in lines if line.strip())  # blank lines are skipped
+    replies = [(await reader.readline()).decode().strip() for _ in range(count)]
+    writer.close()
+    await writer.wait_closed()
+    return replies
+
+
+def test_coalesces_identical_queries():
+    async def run(service, server):
+        results = await asyncio.gather(*(service.query(90) for _ in range(8)))
+        return service, results
+
+    service, results = serve(run)
+    assert results == [str(f(90))] * 8
+    assert service.stats["coalesced"] == 7
+    assert service.stats["batches"] == 1
+
+
+def test_batches_by_modulus():
+    async def run(service, server):
+        queries = [service.query(n, 7) for n in range(10)]
+        queries += [service.query(n) for n in range(10)]
+        return service, await asyncio.gather(*queries)
+
+    service, results = serve(run)
+    assert results[:10] == [str(f(n) % 7) for n in range(10)]
+    assert results[10:] == [str(f(n)) for n in range(10)]
+    assert service.stats["batches"] == 2
+
+
+def test_offloads_large_indices():
+    async def run(service, server):
+        return service, await service.query(INLINE_LIMIT)
+
+    service, result = serve(run)
+    assert result == str(f(INLINE_LIMIT))
+    assert service.stats["offloaded"] == 1
+
+
+def test_rejects_bad_modulus():
+    async def run(service, server):
+        return await service.query(5, 0)
+
+    with pytest.raises(ValueError, match="mod >= 1"):
+        serve(run)
+
+
+def test_replies_in_request_order():
+    async def run(service, server):
+        return await roundtrip(server, ["10", "5000", "3 2", "x", "-6", ""])
+
+    replies = serve(run)
+    assert replies[:3] == ["55", str(f(5000)), "0"]
+    assert replies[3].startswith("error:")
+    assert replies[4] == str(f(-6))
+
+
+def test_rejects_out_of_range_indices():
+    async def run(service, server):
+        return await asyncio.gather(
+            roundtrip(server, ["10 7", "11 7"]),
+            roundtrip(server, [f"{2**64} 7", "101", "100000000"]),
+        )
+
+    first, second = serve(run, max_index=1_000)
+    assert first == [str(f(10) % 7), str(f(11) % 7)]
+    assert second[0].startswith("error: need 0 <= n < 2**64")
+    assert second[1] == str(f(101))
+    assert second[2] == "error: n must be at most 1000, got 100000000"
+
+
+def test_failed_batch_answers_queries_alone(monkeypatch):
+    compute = fib_service._compute
+
+    def flaky(indices, mod):
+        if 13 in indices:
+            raise OverflowError("bad index")
+        return compute(indices, mod)
+
+    monkeypatch.setattr(fib_service, "_compute", flaky)
+
+    async def run(service, server):
+        queries = [service.query(n, 7) for n in (10, 13, 11)]
+        return service, await asyncio.gather(*queries, return_exceptions=True)
+
+    service, (a, err, b) = serve(run)
+    assert (a, b) == (str(f(10) % 7), str(f(11) % 7))
+    assert isinstance(err, OverflowError)
+    assert service.stats["batches"] == 1
+
+
+def test_unix_socket(tmp_path):
+    path = str(tmp_path / "fib.sock")
+
+    async def run():
+        service = FibService(workers=1)
+        server = await start_server(service, path=path)
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b"20\n")
+            reply = await reader.readline()
+            writer.close()
+            await writer.wait_closed()
+            return reply
+        finally:
+            server.close()
+            await service.aclose()
+
+    assert asyncio.run(run()) == b"6765\n"
+
+
+def test_load_test():
+    async def run(service, server):
+        port = server.sockets[0].getsockname()[1]
+        report = await load_test(
+            port=port, clients=4, requests=10, max_index=500
+        )
+        return service, report
+
+    service, report = serve(run)
+    assert report["requests"] == 40
+    assert 0 < report["p50"] <= report["p99"]
+    assert service.stats["queries"] == 40
@@ -1,7 +1,43 @@
+import io
+import json
+import os
+import random
+import sys
+from itertools import islice
+
+import numpy as np
 import pytest
 
-from spyglass_workshop import fibonacci
-from spyglass_workshop.fibonacci import f, f_list, user_input
+from spyglass_workshop import bigint, checkpoints, fibonacci
+from spyglass_workshop.fibonacci import (
+    FibSequence,
+    LinearRecurrence,
+    calibrate,
+    crossover_report,
+    disable_cache,
+    enable_cache,
+    f,
+    f_array,
+    f_digits,
+    f_iter,
+    f_leading_digits,
+    f_list,
+    f_log10,
+    f_many,
+    f_mod,
+    f_mod_many,
+    f_range,
+    format_int,
+    get_backend,
+    load_calibration,
+    pisano_period,
+    set_backend,
+    user_input,
+    write_f_list,
+    write_fib,
+    zeckendorf_decode,
+    zeckendorf_encode,
+)
 
 
 @pytest.mark.parametrize(
@@ -28,6 +64,30 @@ def test_fibonacci(input_n: int, output_n: int) -> None:
     assert fibonacci.f(input_n) == output_n
 
 
+def _f_iterative(n: int) -> int:
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+def test_f_matches_iterative_across_threshold():
+    a, b = 0, 1
+    for n in range(3 * fibonacci.DOUBLING_THRESHOLD):
+        assert f(n) == a
+        a, b = b, a + b
+
+
+def test_f_matches_iterative_randomized():
+    rng = random.Random(2026)
+    for n in rng.sample(range(5_000), 50):
+        assert f(n) == _f_iterative(n)
+
+
+def test_f_negative_is_zero():
+    assert f(-5) == 0
+
+
 def test_f_list_empty():
     assert f_list(0) == []
 
@@ -38,6 +98,571 @@ def test_f_list_values():
     assert f_list(8) == [1, 1, 2, 3, 5, 8, 13, 21]
 
 
+@pytest.mark.parametrize("n", [0, 1, 2, 10, 50, 101])
+def test_fib_sequence_matches_f_list(n):
+    seq = FibSequence(n)
+    expected = f_list(n)
+    assert len(seq) == n
+    assert list(seq) == expected
+    assert [seq[i] for i in range(n)] == expected
+    assert [seq[-i] for i in range(1, n + 1)] == expected[::-1]
+    assert seq == expected
+
+
+@pytest.mark.parametrize(
+    "index",
+    [
+        slice(None),
+        slice(3, 40),
+        slice(7, 8),
+        slice(40, 3),
+        slice(None, None, 7),
+        slice(-20, -3, 2),
+        slice(None, None, -1),
+        slice(95, 200),
+    ],
+)
+def test_fib_sequence_slicing(index):
+    assert FibSequence(100)[index] == f_list(100)[index]
+
+
+def test_fib_sequence_random_access_uses_bounded_cache():
+    seq = FibSequence(10_000, cache_blocks=2)
+    rng = random.Random(0)
+    for i in rng.sample(range(10_000), 30):
+        assert seq[i] == f(i + 1)
+    assert len(seq._blocks) <= 2
+    assert len(seq._seeds) <= 31
+
+
+def test_fib_sequence_sequence_protocol():
+    seq = FibSequence(12)
+    assert 144 in seq
+    assert 145 not in seq
+    assert seq.index(21) == 7
+    assert list(reversed(seq)) == f_list(12)[::-1]
+    assert seq != f_list(11)
+    assert repr(seq) == "FibSequence(12)"
+
+
+def test_fib_sequence_index_error():
+    with pytest.raises(IndexError):
+        FibSequence(5)[5]
+    with pytest.raises(IndexError):
+        FibSequence(5)[-6]
+
+
+@pytest.mark.parametrize("start", [0, 1, 5, 100, 12_345])
+def test_f_iter(start):
+    assert list(islice(f_iter(start), 30)) == [f(start + i) for i in range(30)]
+
+
+@pytest.mark.parametrize(
+    "start,stop,step",
+    [
+        (0, 10, 1),
+        (3, 50, 7),
+        (10, 10, 1),
+        (20, 5, 1),
+        (1_000, 1_100, 1),
+        (10**5, 10**5 + 50_000, 10_000),
+        (0, 200, 64),
+    ],
+)
+def test_f_range(start, stop, step):
+    assert list(f_range(start, stop, step)) == [
+        f(i) for i in range(start, stop, step)
+    ]
+
+
+def test_f_range_and_iter_reject_bad_arguments():
+    with pytest.raises(ValueError, match="step"):
+        next(f_range(0, 10, 0))
+    with pytest.raises(ValueError, match="start"):
+        next(f_range(-1, 10))
+    with pytest.raises(ValueError, match="start"):
+        next(f_iter(-1))
+
+
+@pytest.mark.parametrize("m", [1, 2, 7, 10, 97, 1_000, 2**31 - 1, 2**40 + 1])
+def test_f_mod_matches_f(m):
+    rng = random.Random(m)
+    ns = [0, 1, 2] + rng.sample(range(3, 3_000), 40)
+    for n in ns:
+        assert f_mod(n, m) == f(n) % m
+        assert f_mod(n, m, pisano=True) == f(n) % m
+    np.testing.assert_array_equal(
+        f_mod_many(ns, m).astype(object), [f(n) % m for n in ns]
+    )
+    np.testing.assert_array_equal(
+        f_mod_many(ns, m, pisano=True).astype(object), [f(n) % m for n in ns]
+    )
+
+
+def test_f_mod_many_huge_indices():
+    ns = np.array([[10**18, 2**63 + 5], [0, 123_456_789_012]], dtype=np.uint64)
+    out = f_mod_many(ns, 10**9 + 7)
+    assert out.shape == ns.shape
+    assert [int(x) for x in out.ravel()] == [
+        f_mod(int(n), 10**9 + 7) for n in ns.ravel()
+    ]
+
+
+def test_f_mod_many_indices_beyond_uint64():
+    ns = [2**64, 10, 2**70 + 1]
+    assert list(f_mod_many(ns, 7)) == [f_mod(n, 7) for n in ns]
+    assert list(f_mod_many(ns, 7, pisano=True)) == [f_mod(n, 7) for n in ns]
+
+
+def test_f_mod_many_rejects_non_integers():
+    with pytest.raises(TypeError, match="integers"):
+        f_mod_many([3.7, 4.2], 7)
+    with pytest.raises(TypeError, match="integers"):
+        f_mod_many([2**64, 1.5], 7)
+    with pytest.raises(TypeError, match="integers"):
+        f_mod_many(np.array([True]), 7)
+    assert f_mod_many([], 7).size == 0
+
+
+def test_f_mod_many_big_modulus_is_object():
+    m = 2**70 + 3
+    out = f_mod_many([5, 300], m)
+    assert out.dtype == object
+    assert list(out) == [5, f(300) % m]
+
+
+def _pisano_brute(m):
+    a, b, n = 0, 1 % m, 0
+    while True:
+        a, b, n = b, (a + b) % m, n + 1
+        if (a, b) == (0, 1 % m):
+            return n
+
+
+def test_pisano_period_matches_brute_force():
+    for m in range(1, 300):
+        assert pisano_period(m) == _pisano_brute(m), m
+
+
+def test_f_mod_rejects_bad_arguments():
+    with pytest.raises(ValueError, match="modulus"):
+        f_mod(5, 0)
+    with pytest.raises(ValueError, match="non-negative"):
+        f_mod(-1, 5)
+    with pytest.raises(ValueError, match="modulus"):
+        f_mod_many([1], 0)
+    with pytest.raises(ValueError, match="non-negative"):
+        f_mod_many([1, -1], 5)
+    with pytest.raises(ValueError, match="modulus"):
+        pisano_period(0)
+
+
+def test_f_many_matches_f():
+    rng = random.Random(35)
+    indices = [rng.randrange(20_000) for _ in range(300)]
+    indices += [0, -3, 5, 5, 19_999, 1]
+    assert f_many(indices) == [f(i) for i in indices]
+
+
+def test_f_many_empty():
+    assert f_many([]) == []
+
+
+@pytest.mark.parametrize("n", [0, 1, 10, 93])
+def test_f_array_matches_f_list(n):
+    arr = f_array(n)
+    assert arr.dtype == np.uint64
+    assert arr.flags.c_contiguous and arr.flags.writeable
+    assert [int(x) for x in arr] == f_list(n)
+
+
+@pytest.mark.parametrize(
+    "dtype,limit",
+    [(np.uint64, 93), (np.int64, 92), (np.int32, 46), (np.uint8, 13)],
+)
+def test_f_array_overflow(dtype, limit):
+    assert f_array(limit, dtype).dtype == dtype
+    assert int(f_array(limit, dtype)[-1]) == f(limit)
+    with pytest.raises(OverflowError, match=f"at most {limit} terms"):
+        f_array(limit + 1, dtype)
+
+
+def test_f_array_rejects_float_dtype():
+    with pytest.raises(TypeError, match="integer"):
+        f_array(5, np.float64)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 9, 500])
+def test_f_list_parallel_matches_sequential(n):
+    assert f_list(n, strategy="parallel", workers=2) == f_list(n)
+
+
+@pytest.mark.parametrize("base", [10, 16])
+def test_write_f_list_in_order(base):
+    out = io.StringIO()
+    write_f_list(300, out, workers=2, base=base, sep=",")
+    assert out.getvalue() == "".join(
+        f"{format_int(x, base)}," for x in f_list(300)
+    )
+
+
+def test_segments_cover_indices():
+    for n, count in [(1, 4), (10, 3), (1_000, 16)]:
+        segments = fibonacci._segments(n, count)
+        indices = [s + i for s, c in segments for i in range(c)]
+        assert indices == list(range(1, n + 1))
+    # later segments are shorter: their terms are longer
+    lengths = [c for _, c in fibonacci._segments(10_000, 8)]
+    assert lengths == sorted(lengths, reverse=True)
+
+
+def _zeckendorf_loop(x):
+    bits = 0
+    for i in range(63, -1, -1):
+        if f(i + 2) <= x:
+            bits |= 1 << i
+            x -= f(i + 2)
+    return bits
+
+
+def test_zeckendorf_matches_greedy_loop():
+    rng = np.random.default_rng(44)
+    values = np.concatenate(
+        [
+            np.arange(300),
+            rng.integers(0, 200_000, 500),
+            rng.integers(0, fibonacci.ZECKENDORF_LIMIT, 500, dtype=np.uint64),
+            [fibonacci.ZECKENDORF_LIMIT - 1, 121_392, 121_393],
+        ]
+    ).astype(np.uint64)
+    bits = zeckendorf_encode(values)
+    assert bits.dtype == np.uint64
+    assert [int(b) for b in bits] == [_zeckendorf_loop(int(v)) for v in values]
+    np.testing.assert_array_equal(zeckendorf_decode(bits), values)
+
+
+def test_zeckendorf_keeps_shape():
+    values = np.arange(12, dtype=np.int32).reshape(3, 4)
+    bits = zeckendorf_encode(values)
+    assert bits.shape == (3, 4)
+    np.testing.assert_array_equal(zeckendorf_decode(bits), values)
+    assert zeckendorf_encode([]).shape == (0,)
+
+
+def test_zeckendorf_errors():
+    with pytest.raises(ValueError, match="non-negative"):
+        zeckendorf_encode([3, -1])
+    with pytest.raises(OverflowError, match="F\\(66\\)"):
+        zeckendorf_encode([fibonacci.ZECKENDORF_LIMIT])
+    with pytest.raises(TypeError, match="integers"):
+        zeckendorf_encode([1.5])
+    with pytest.raises(ValueError, match="adjacent"):
+        zeckendorf_decode([0b110])
+
+
+def _recurrence_loop(coeffs, seeds, n):
+    terms = list(seeds)
+    while len(terms) <= n:
+        terms.append(sum(c * t for c, t in zip(coeffs, terms[::-1])))
+    return terms[n]
+
+
+@pytest.mark.parametrize(
+    "coeffs,seeds",
+    [
+        ((1, 1), (2, 1)),  # Lucas
+        ((2, 1), (0, 1)),  # Pell
+        ((1, 1, 1), (0, 0, 1)),  # Tribonacci
+        ((3,), (1,)),  # powers of 3
+        ((0, 2, -1, 5), (1, -2, 0, 4)),  # arbitrary order 4
+    ],
+)
+def test_linear_recurrence_matches_loop(coeffs, seeds):
+    rec = LinearRecurrence(coeffs, seeds)
+    rng = random.Random(len(coeffs))
+    for n in list(range(60)) + rng.sample(range(60, 2_000), 20):
+        expected = _recurrence_loop(coeffs, seeds, n)
+        assert rec.term(n) == expected
+        assert rec.term_mod(n, 10**9 + 7) == expected % (10**9 + 7)
+    assert list(islice(rec.iter(500), 5)) == [
+        _recurrence_loop(coeffs, seeds, n) for n in range(500, 505)
+    ]
+
+
+def test_linear_recurrence_window():
+    rec = LinearRecurrence((1, 1, 1), (0, 0, 1))
+    n = 1_000
+    assert rec.window(n) == tuple(rec.term(n + j) for j in range(3))
+    assert rec.window_mod(n, 97) == tuple(
+        rec.term(n + j) % 97 for j in range(3)
+    )
+
+
+def test_linear_recurrence_errors():
+    with pytest.raises(ValueError, match="coefficients"):
+        LinearRecurrence((1, 1), (0,))
+    with pytest.raises(ValueError, match="coefficients"):
+        LinearRecurrence((), ())
+    rec = LinearRecurrence((1, 1), (0, 1))
+    with pytest.raises(ValueError, match="non-negative"):
+        rec.term(-1)
+    with pytest.raises(ValueError, match="modulus"):
+        rec.term_mod(5, 0)
+    assert repr(rec) == "LinearRecurrence((1, 1), (0, 1))"
+
+
+def test_digit_estimates_match_exact():
+    rng = random.Random(40)
+    for n in [0, 1, 2, 7, 999, 1_000, 1_001] + rng.sample(range(20_000), 40):
+        digits = str(f(n))
+        assert f_digits(n) == len(digits)
+        k = rng.randrange(1, 80)
+        assert f_leading_digits(n, k) == int(digits[:k])
+        assert f_leading_digits(n, len(digits) + 1) == int(digits)
+        if n > 0:
+            assert f_log10(n) == pytest.approx(
+                len(digits) - 1 + np.log10(float("0." + digits[:17]) * 10)
+            )
+
+
+def test_digit_estimates_fall_back_near_boundary(monkeypatch):
+    # A tolerance of 1 makes every estimate ambiguous.
+    monkeypatch.setattr(fibonacci, "_BOUNDARY_TOL", 1)
+    digits = str(f(5_000))
+    assert f_digits(5_000) == len(digits)
+    assert f_leading_digits(5_000, 12) == int(digits[:12])
+
+
+def test_digit_estimates_errors():
+    with pytest.raises(ValueError, match="no logarithm"):
+        f_log10(0)
+    with pytest.raises(ValueError, match="positive"):
+        f_leading_digits(10, 0)
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 50, 127, 128, 129, 1_000])
+def test_f_strategies_agree(n):
+    expected = f(n)
+    assert f(n, strategy="iterative") == expected
+    assert f(n, strategy="doubling") == expected
+
+
+def test_strategy_rejects_unknown():
+    with pytest.raises(ValueError, match="strategy"):
+        f(10, strategy="fft")
+    with pytest.raises(ValueError, match="strategy"):
+        f_list(10, strategy="doubling")
+    assert f_list(5, strategy="iterative") == [1, 1, 2, 3, 5]
+
+
+@pytest.fixture
+def restore_threshold(monkeypatch):
+    names = (
+        "DOUBLING_THRESHOLD",
+        "_CALIBRATION_SOURCE",
+        "BACKEND_THRESHOLD",
+        "_AUTO_BACKEND",
+    )
+    for name in names:
+        monkeypatch.setattr(fibonacci, name, getattr(fibonacci, name))
+    monkeypatch.setattr(
+        fibonacci.FIBONACCI, "threshold", fibonacci.FIBONACCI.threshold
+    )
+
+
+def test_calibrate_persists_and_loads(tmp_path, restore_threshold):
+    path = tmp_path / "calibration.json"
+    thresholds = calibrate(path, repeat=1)
+    assert fibonacci.DOUBLING_THRESHOLD == thresholds["doubling_threshold"]
+    assert str(path) in crossover_report()
+
+    fibonacci._set_threshold(7, "test")
+    assert load_calibration(path)
+    assert fibonacci.FIBONACCI.threshold == thresholds["doubling_threshold"]
+    assert f(300) == f(300, strategy="iterative")
+
+
+def test_calibrate_when_doubling_never_wins(
+    tmp_path, restore_threshold, monkeypatch
+):
+    def timed(func, number, repeat):
+        return [2.0 if func.args[1] == "doubling" else 1.0]
+
+    monkeypatch.setattr(fibonacci.timeit, "repeat", timed)
+    path = tmp_path / "calibration.json"
+    thresholds = calibrate(path, repeat=1)
+    assert thresholds["doubling_threshold"] > 256
+    assert "doubling lost at every n <= 256" in crossover_report()
+
+    fibonacci._set_threshold(7, "test")
+    assert load_calibration(path)
+    assert fibonacci.DOUBLING_THRESHOLD == thresholds["doubling_threshold"]
+    assert "doubling lost" in crossover_report()
+
+
+def test_calibrate_picks_faster_backend(
+    tmp_path, restore_threshold, monkeypatch
+):
+    def timed(func, number, repeat):
+        if func.func is fibonacci._f_in_backend:
+            n, name = func.args
+            faster = name == "decimal" and n >= 2**14
+            return [0.5 if faster else 1.0]
+        return [2.0 if func.args[1] == "iterative" else 1.0]
+
+    monkeypatch.setattr(fibonacci.timeit, "repeat", timed)
+    path = tmp_path / "calibration.json"
+    thresholds = calibrate(path, repeat=1)
+    assert thresholds["backend"] == "decimal"
+    assert thresholds["backend_threshold"] == 2**14
+    assert "int for n < 16384, decimal from n = 16384" in crossover_report()
+
+    used = []
+    real_native = fibonacci._f_native
+
+    def native(n, backend=None):
+        used.append(backend.name)
+        return real_native(n, backend)
+
+    monkeypatch.setattr(fibonacci, "_f_native", native)
+    assert f(2**14) == f(2**14, strategy="iterative")
+    assert f(2**13) == f(2**13, strategy="iterative")
+    assert used == ["decimal", "int"]
+
+    fibonacci._set_backend_threshold(None, None)
+    assert load_calibration(path)
+    assert fibonacci.BACKEND_THRESHOLD == 2**14
+    assert fibonacci._AUTO_BACKEND.name == "decimal"
+
+    record = json.loads(path.read_text())
+    record["thresholds"]["backend"] = "missing"
+    path.write_text(json.dumps(record))
+    assert load_calibration(path)
+    assert fibonacci._AUTO_BACKEND is None
+    assert "big integers: int\n" in crossover_report()
+
+
+def test_load_calibration_ignores_bad_file(tmp_path, restore_threshold):
+    before = fibonacci.DOUBLING_THRESHOLD
+    assert not load_calibration(tmp_path / "missing.json")
+    (tmp_path / "bad.json").write_text("{not json")
+    assert not load_calibration(tmp_path / "bad.json")
+    assert fibonacci.DOUBLING_THRESHOLD == before
+
+
+@pytest.fixture(params=bigint.available_backends())
+def backend(request):
+    set_backend(request.param)
+    yield request.param
+    set_backend("int")
+
+
+def test_backends_match_int(backend):
+    assert get_backend() == backend
+    for n in [0, 1, 127, 128, 500, 5_000]:
+        assert f(n) == f(n, strategy="iterative")
+        assert type(f(n)) is int
+        assert format_int(fibonacci._f_native(n)) == str(f(n))
+
+
+def test_write_fib_same_for_backends(backend):
+    out = io.StringIO()
+    write_fib(300, out, base=16)
+    set_backend("int")
+    expected = io.StringIO()
+    write_fib(300, expected, base=16)
+    assert out.getvalue() == expected.getvalue()
+
+
+def test_set_backend_rejects_unknown():
+    with pytest.raises(ValueError, match="backend"):
+        set_backend("mpfr")
+
+
+@pytest.fixture
+def fib_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "CACHE_MIN_BITS", 4)
+    enable_cache(tmp_path)
+    yield tmp_path
+    disable_cache()
+
+
+def test_cache_matches_uncached(fib_cache):
+    ns = [1, 15, 16, 17, 100, 1_024, 5_000, 5_003, 4_000, 12_345]
+    cached = [f(n) for n in ns]
+    disable_cache()
+    assert cached == [f(n) for n in ns]
+    assert (fib_cache / "fib-4096.bin").exists()  # ladder for 5_000
+    assert (fib_cache / "fib-5000.bin").exists()
+
+
+def test_cache_hit_skips_computation(fib_cache, monkeypatch):
+    expected = f(3_000)
+
+    def fail(*args):
+        raise AssertionError("recomputed")
+
+    monkeypatch.setattr(fibonacci.FIBONACCI, "window", fail)
+    monkeypatch.setattr(fibonacci.FIBONACCI, "advance", fail)
+    assert f(3_000) == expected
+
+
+def test_cache_ignores_corrupt_file(fib_cache):
+    expected = f(2_000)
+    (fib_cache / "fib-2000.bin").write_bytes(b"FIBK\x01garbage")
+    assert f(2_000) == expected
+
+
+def test_cache_hit_when_mtime_cannot_be_updated(fib_cache, monkeypatch):
+    expected = f(3_000)
+
+    def fail(*args):
+        raise AssertionError("recomputed")
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only cache")
+
+    monkeypatch.setattr(checkpoints.os, "utime", read_only)
+    monkeypatch.setattr(fibonacci.FIBONACCI, "window", fail)
+    monkeypatch.setattr(fibonacci.FIBONACCI, "advance", fail)
+    assert f(3_000) == expected
+
+
+def test_cache_lists_directory_only_after_outside_changes(fib_cache):
+    cache = fibonacci._CACHE
+    f(3_000)
+    listings = []
+    scan = cache._scan
+
+    def counting_scan():
+        before = cache._scanned
+        scan()
+        listings.append(cache._scanned != before)
+
+    cache._scan = counting_scan
+    for n in (3_001, 3_500, 7_000):
+        f(n)
+    assert not any(listings)
+    # Another process adding a checkpoint is picked up on the next miss.
+    other = checkpoints.CheckpointCache(fib_cache, 1 << 30, fibonacci.FIBONACCI)
+    other.window(9_000)
+    os.utime(fib_cache, ns=(0, 1))  # coarse-mtime file systems
+    assert cache._nearest_below(9_001) == 9_000
+
+
+def test_cache_evicts_to_max_bytes(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoints, "CACHE_MIN_BITS", 4)
+    enable_cache(tmp_path, max_bytes=4_000)
+    try:
+        for n in range(1_000, 20_000, 1_000):
+            f(n)
+    finally:
+        disable_cache()
+    files = list(tmp_path.glob("fib-*.bin"))
+    assert sum(p.stat().st_size for p in files) <= 4_000
+    assert not list(tmp_path.glob("*.tmp"))
+
+
 def test_user_input(monkeypatch):
     monkeypatch.setattr("builtins.input", lambda _: "7")
     result = user_input()
@@ -49,3 +674,54 @@ def test_user_input_invalid(monkeypatch):
     monkeypatch.setattr("builtins.input", lambda _: "abc")
     with pytest.raises(ValueError):
         user_input()
+
+
+def test_user_input_format_unchanged(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda _: "7")
+    assert user_input() == (
+        "Fibonacci number 7 is: 13. The full list is:\n[1, 1, 2, 3, 5, 8, 13]"
+    )
+
+
+def test_user_input_streams_to_file(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda _: "5")
+    out = io.StringIO()
+    assert user_input(out, base=16) == ""
+    assert out.getvalue() == (
+        "Fibonacci number 5 is: 0x5. The full list is:\n"
+        "[0x1, 0x1, 0x2, 0x3, 0x5]"
+    )
+
+
+def test_format_int_matches_str():
+    rng = random.Random(37)
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        for bits in [1, 100, 5_000, 20_000, 100_000]:
+            x = rng.getrandbits(bits)
+            assert format_int(x) == str(x)
+            assert format_int(-x) == str(-x)
+    finally:
+        sys.set_int_max_str_digits(limit)
+
+
+def test_format_int_beyond_str_digit_limit():
+    x = f(30_000)  # 6270 digits, over the default 4300 limit
+    digits = format_int(x)
+    assert len(digits) == 6_270
+    assert int(digits[-10:]) == x % 10**10
+    assert format_int(x, 16) == hex(x)[2:]
+
+
+def test_format_int_rejects_base():
+    with pytest.raises(ValueError, match="base"):
+        format_int(10, 3)
+
+
+def test_write_fib_chunks_large_numbers():
+    out = io.StringIO()
+    write_fib(25_000, out)
+    text = out.getvalue()
+    assert text.startswith("Fibonacci number 25000 is: ")
+    assert text.count(", ") == 24_999
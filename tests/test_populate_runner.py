@@ -0,0 +1,112 @@
+"""Tests for the parallel populate runner, without a database."""
+
+import concurrent.futures
+import json
+import zlib
+
+import pytest
+
+from spyglass_workshop import populate_runner as pr
+
+SPEC = "tests.test_populate_runner:FakeTable"
+
+
+class FakeTable:
+    """Stands in for a DataJoint table; each populate pass finds 3 keys."""
+
+    primary_key = ["subject_id", "param_name"]
+
+    def populate(self, *restrictions, max_calls=None, **kwargs):
+        assert kwargs["reserve_jobs"] and kwargs["suppress_errors"]
+        done = 3 if max_calls is None else min(3, max_calls)
+        errors = [("key", "boom")] if restrictions else []
+        return {"success_count": done, "error_list": errors}
+
+    class Part:
+        pass
+
+
+def test_load_table():
+    assert pr.load_table(SPEC) is FakeTable
+    assert pr.load_table(SPEC + ".Part") is FakeTable.Part
+    with pytest.raises(ValueError, match="module:Class"):
+        pr.load_table("tests.test_populate_runner")
+
+
+def test_shard_restriction():
+    sql = pr.shard_restriction(["subject_id", "param_name"], 2, 5)
+    assert sql == (
+        "CRC32(CONCAT_WS(CHAR(31), `subject_id`, `param_name`)) % 5 = 2"
+    )
+    with pytest.raises(ValueError):
+        pr.shard_restriction(["subject_id"], 5, 5)
+
+
+def test_shard_of_matches_crc32_and_spreads():
+    key = {"subject_id": "s1", "param_name": "default", "extra": 1}
+    pk = FakeTable.primary_key
+    assert pr.shard_of(key, pk, 7) == zlib.crc32(b"s1\x1fdefault") % 7
+    shards = [pr.shard_of({"n": n}, ["n"], 4) for n in range(400)]
+    assert all(60 < shards.count(s) < 140 for s in range(4))
+
+
+def test_run_worker_sharded_then_leftovers():
+    result = pr.run_worker(SPEC, shard=1, n_shards=4)
+    assert (result["keys"], result["errors"]) == (6, 1)
+    assert pr.run_worker(SPEC, shard=1, n_shards=4, max_calls=2)["keys"] == 2
+    result = pr.run_worker(SPEC, shard=[1, 3], n_shards=4)
+    assert (result["keys"], result["errors"]) == (9, 2)
+
+
+def test_run_shares_host_shards(monkeypatch):
+    calls = []
+
+    def worker(spec, shard, n_shards, max_calls):
+        calls.append((shard, n_shards))
+        return {"keys": 0, "errors": 0, "seconds": 0.0}
+
+    class Pool:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, *args):
+            future = concurrent.futures.Future()
+            future.set_result(fn(*args))
+            return future
+
+    monkeypatch.setattr(pr, "run_worker", worker)
+    monkeypatch.setattr(pr.concurrent.futures, "ProcessPoolExecutor", Pool)
+    pr.run(SPEC, 3, shard=True, hosts=2, host_index=1, shards_per_host=4)
+    assert calls == [([4, 7], 8), ([5], 8), ([6], 8)]
+    calls.clear()
+    pr.run(SPEC, 2, shard=True, hosts=2, host_index=0)
+    assert calls == [([0], 4), ([1], 4)]
+    with pytest.raises(ValueError, match="shards_per_host"):
+        pr.run(SPEC, 2, shard=True, shards_per_host=0)
+
+
+def test_run_sums_workers():
+    report = pr.run(SPEC, processes=2, shard=True, hosts=2, host_index=1)
+    assert report["workers"] == 2
+    assert (report["keys"], report["errors"]) == (12, 2)
+    assert report["keys_per_second"] > 0
+    with pytest.raises(ValueError, match="host_index"):
+        pr.run(SPEC, hosts=2, host_index=2)
+
+
+def test_main_json(capsys):
+    assert pr.main([SPEC, "-p", "1", "--json"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["keys"], report["errors"]) == (3, 0)
+
+
+def test_main_rejects_bad_processes(capsys):
+    with pytest.raises(SystemExit):
+        pr.main([SPEC, "-p", "0"])
+    assert "processes must be positive" in capsys.readouterr().err
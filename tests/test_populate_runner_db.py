@@ -0,0 +1,66 @@
+"""Run the populate runner against a real MySQL server.
+
+Skipped unless ``DJ_HOST`` is set.  With a local container::
+
+    docker run -d --name dj-test -p 3306:3306 \\
+        -e MYSQL_ROOT_PASSWORD=tutorial datajoint/mysql:8.0
+    DJ_HOST=127.0.0.1 DJ_USER=root DJ_PASS=tutorial \\
+        pytest tests/test_populate_runner_db.py
+"""
+
+import os
+
+import pytest
+
+if not os.getenv("DJ_HOST"):
+    pytest.skip("DJ_HOST is not set", allow_module_level=True)
+dj = pytest.importorskip("datajoint")
+
+from spyglass_workshop import populate_runner as pr
+
+SPEC = "tests.test_populate_runner_db:Square"
+N_KEYS = 200
+
+schema = dj.schema(f"{dj.config['database.user']}_populate_runner_test")
+
+
+@schema
+class Number(dj.Lookup):
+    definition = """
+    n : int
+    """
+    contents = [[n] for n in range(N_KEYS)]
+
+
+@schema
+class Square(dj.Computed):
+    definition = """
+    -> Number
+    ---
+    square : bigint
+    """
+
+    def make(self, key):
+        self.insert1({**key, "square": key["n"] ** 2})
+
+
+@pytest.fixture
+def clean():
+    Square.delete(safemode=False)
+    schema.jobs.delete()
+    yield
+    Square.delete(safemode=False)
+
+
+@pytest.mark.parametrize("shard", [False, True])
+def test_parallel_populate(clean, shard):
+    report = pr.run(SPEC, processes=4, shard=shard)
+    assert (report["keys"], report["errors"]) == (N_KEYS, 0)
+    assert len(Square()) == N_KEYS
+    assert len(schema.jobs) == 0
+
+
+def test_shard_restriction_matches_python():
+    sql = pr.shard_restriction(Number.primary_key, 1, 3)
+    keys = (Number & sql).fetch("KEY")
+    assert keys and all(pr.shard_of(k, ["n"], 3) == 1 for k in keys)
@@ -0,0 +1,53 @@
+"""Test ``schema_template`` methods that need its tables declared.
+
+Skipped unless ``DJ_HOST`` is set and Spyglass is installed; see
+``test_populate_runner_db.py`` for a local MySQL container.
+"""
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+if not os.getenv("DJ_HOST"):
+    pytest.skip("DJ_HOST is not set", allow_module_level=True)
+pd = pytest.importorskip("pandas")
+pytest.importorskip("spyglass")
+
+from spyglass_workshop import schema_template as st
+
+
+def test_channel_stats_applies_channel_conversion(monkeypatch):
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(1000, 3))
+    electrodes = pd.DataFrame({"group_name": ["0", "0", "1"]}, index=[4, 5, 6])
+    series = SimpleNamespace(
+        data=data,
+        conversion=2.0,
+        offset=0.1,
+        channel_conversion=[1.0, 0.5, 3.0],
+        electrodes=SimpleNamespace(to_dataframe=lambda: electrodes),
+    )
+    nwb = SimpleNamespace(objects={"raw": series})
+    monkeypatch.setattr(st, "get_nwb_file", lambda path: nwb)
+
+    key = {"nwb_file_name": "test_.nwb"}
+    table = SimpleNamespace(block_size=128)
+    n_samples, rows = st.ChannelStats.make_compute(table, key, "x.nwb", "raw")
+
+    volts = data * 2.0 * np.array([1.0, 0.5, 3.0]) + 0.1
+    assert n_samples == 1000
+    assert [r["electrode_id"] for r in rows] == [4, 5, 6]
+    np.testing.assert_allclose(
+        [r["mean"] for r in rows], volts.mean(axis=0), rtol=1e-6
+    )
+    np.testing.assert_allclose(
+        [r["std"] for r in rows], volts.std(axis=0), rtol=1e-6
+    )
+
+    del series.channel_conversion
+    _, rows = st.ChannelStats.make_compute(table, key, "x.nwb", "raw")
+    np.testing.assert_allclose(
+        [r["std"] for r in rows], (data * 2.0).std(axis=0), rtol=1e-6
+    )
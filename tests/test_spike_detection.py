@@ -0,0 +1,55 @@
+"""Tests for vectorized MAD-threshold spike detection."""
+
+import numpy as np
+import pytest
+
+from spyglass_workshop.spike_detection import detect_spikes, mad_thresholds
+
+
+def _detect_loop(data, thresholds, refractory):
+    """Reference per-sample implementation."""
+    events = []
+    for ch, (signal, thr) in enumerate(zip(data, thresholds)):
+        last = -refractory
+        for t in range(len(signal)):
+            above_before = t == 0 or signal[t - 1] > thr
+            if above_before and signal[t] <= thr and t - last >= refractory:
+                events.append((t, ch))
+                last = t
+    return np.array(sorted(events), dtype=np.int64).reshape(-1, 2)
+
+
+@pytest.fixture
+def recording():
+    rng = np.random.default_rng(0)
+    return rng.standard_normal((4, 20_000))
+
+
+def test_mad_thresholds_of_gaussian_noise(recording):
+    thr = mad_thresholds(recording, k=5.0)
+    np.testing.assert_allclose(thr, -5.0, atol=0.15)
+
+
+@pytest.mark.parametrize("block_size", [64, 1_000, 50_000])
+@pytest.mark.parametrize("refractory", [1, 5, 30])
+def test_detect_spikes_matches_loop(recording, block_size, refractory):
+    thr = mad_thresholds(recording, k=2.0)
+    result = detect_spikes(
+        recording, refractory=refractory, block_size=block_size, thresholds=thr
+    )
+    np.testing.assert_array_equal(
+        result, _detect_loop(recording, thr, refractory)
+    )
+
+
+def test_detect_spikes_finds_injected_spikes(recording):
+    data = recording.copy()
+    data[2, [500, 505, 900]] = -50.0
+    data[0, 12_345] = -50.0
+    spikes = detect_spikes(data, k=8.0, refractory=10, block_size=256)
+    np.testing.assert_array_equal(spikes, [[500, 2], [900, 2], [12_345, 0]])
+
+
+def test_detect_spikes_none_found():
+    spikes = detect_spikes(np.zeros((2, 100)), thresholds=[-1.0, -1.0])
+    assert spikes.shape == (0, 2)
@@ -6,3 +6,17 @@ from spyglass_workshop import utils
 def test_schema_prefix_is_string():
     assert isinstance(utils.SCHEMA_PREFIX, str)
     assert len(utils.SCHEMA_PREFIX) > 0
+
+
+class FakeConnection:
+    def query(self, sql, args=()):
+        return sql
+
+
+def test_count_queries():
+    conn = FakeConnection()
+    with utils.count_queries(conn) as counter:
+        assert conn.query("SELECT 1") == "SELECT 1"
+        conn.query("SELECT 2", args=(1,))
+    conn.query("SELECT 3")
+    assert counter == {"queries": 2}